@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compressed Uploads (FLAC)
+Lamba phrase = bada upload. Audio bolte-bolte hi FLAC me encode hota rehta hai (aur
+recognizer jitna kam sample rate maane, utne par resample), to phrase khatam hote hi
+chhota payload taiyaar hota hai. Kitna compress hua aur upload ka kitna time bacha,
+woh bhi gina jaata hai.
+
+Usage:
+    python audio_encoder.py recording.wav --rate 8000 --uplink-kbps 128
+"""
+
+import argparse
+import os
+import subprocess
+import threading
+import time
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+SAMPLE_RATE = 16000   # Capture rate (vad.SAMPLE_RATE)
+
+
+class StreamingResampler:
+    """Block-by-block sample rate conversion of int16 audio
+
+    Low-pass FIR (windowed sinc, below the lower Nyquist rate) followed by
+    linear interpolation. Filter history and the fractional read position
+    carry over between blocks, so the output does not depend on how the
+    input was split.
+    """
+
+    def __init__(self, from_rate, to_rate, taps=63):
+        self.ratio = from_rate / to_rate
+        cutoff = 0.45 * min(from_rate, to_rate) / from_rate   # Cycles per input sample
+        n = np.arange(taps) - (taps - 1) / 2
+        kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(taps)
+        self.kernel = kernel / kernel.sum()
+        self._history = np.zeros(taps - 1)
+        self._last = 0.0       # Filtered sample just before the current block
+        self._position = 0.0   # Next output position, in samples of the current block
+
+    def process(self, samples):
+        if len(samples) == 0:
+            return np.zeros(0, dtype=np.int16)
+        x = np.concatenate([self._history, samples.astype(np.float64)])
+        self._history = x[len(x) - len(self._history):]
+        filtered = np.convolve(x, self.kernel, mode='valid')
+
+        last = len(filtered) - 1
+        count = int((last - self._position) // self.ratio) + 1 if last >= self._position else 0
+        positions = self._position + self.ratio * np.arange(count)
+        # Index 0 of `padded` is the previous block's last sample (position -1)
+        padded = np.concatenate([[self._last], filtered])
+        out = np.interp(positions + 1, np.arange(len(padded)), padded)
+        self._position += count * self.ratio - len(filtered)
+        self._last = filtered[-1]
+        return np.clip(np.round(out), -32768, 32767).astype(np.int16)
+
+
+class FlacStreamEncoder:
+    """Feeds audio to speech_recognition's bundled `flac` binary as it arrives
+
+    `write()` int16 samples at `input_rate` while capturing; `finish()`
+    returns the FLAC bytes at `sample_rate`. The encoder runs in its own
+    process, so by the end of the utterance nearly all of it is encoded.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, input_rate=SAMPLE_RATE, level=8):
+        self.sample_rate = sample_rate
+        self.input_rate = input_rate
+        self.resampler = StreamingResampler(input_rate, sample_rate) if sample_rate != input_rate else None
+        self.raw_bytes = 0        # 16-bit PCM at the input rate (what would be uploaded raw)
+        self.finish_seconds = None
+        startup_info = None
+        if os.name == 'nt':
+            # No console window flashing up for the encoder
+            startup_info = subprocess.STARTUPINFO()
+            startup_info.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startup_info.wShowWindow = subprocess.SW_HIDE
+        self.process = subprocess.Popen(
+            [sr.get_flac_converter(), '--stdout', '--totally-silent', f'-{level}',
+             '--force-raw-format', '--endian=little', '--sign=signed', '--channels=1',
+             '--bps=16', f'--sample-rate={sample_rate}', '-'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, startupinfo=startup_info,
+        )
+        self._output = []
+        # Drain stdout continuously so a full pipe never blocks write()
+        self._reader = threading.Thread(target=self._read, name="FlacEncoder", daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        for block in iter(lambda: self.process.stdout.read(65536), b''):
+            self._output.append(block)
+
+    def write(self, samples):
+        self.raw_bytes += len(samples) * 2
+        if self.resampler:
+            samples = self.resampler.process(samples)
+        self.process.stdin.write(samples.astype('<i2').tobytes())
+
+    def finish(self):
+        """Close the stream and return the complete FLAC file"""
+        started = time.perf_counter()
+        self.process.stdin.close()
+        self._reader.join()
+        self.process.wait()
+        self.finish_seconds = time.perf_counter() - started
+        if self.process.returncode:
+            raise RuntimeError(f"flac encoder exited with {self.process.returncode}")
+        data = b''.join(self._output)
+        upload_stats.add(self.raw_bytes, len(data), self.finish_seconds)
+        return data
+
+    def abort(self):
+        self.process.kill()
+        self.process.wait()
+
+
+class EncodedAudioData(sr.AudioData):
+    """Ordinary AudioData (raw PCM) that also carries its FLAC upload
+
+    Offline engines, the cache and the spool keep using the raw PCM;
+    `for_upload()` is what GoogleEngine sends.
+    """
+
+    def __init__(self, frame_data, sample_rate, sample_width, flac_data, flac_rate):
+        super().__init__(frame_data, sample_rate, sample_width)
+        self.flac_data = flac_data
+        self.flac_rate = flac_rate
+
+    def for_upload(self):
+        return _FlacUpload(self.flac_data, self.flac_rate)
+
+
+class _FlacUpload(sr.AudioData):
+    """What recognize_google sees: the rate of the FLAC and its ready-made bytes"""
+
+    def __init__(self, flac_data, sample_rate):
+        super().__init__(b'', sample_rate, 2)
+        self.flac_data = flac_data
+
+    def get_flac_data(self, convert_rate=None, convert_width=None):
+        return self.flac_data
+
+
+def upload_form(audio):
+    """The audio to send to an online recognizer (pre-encoded FLAC when there is one)"""
+    return audio.for_upload() if isinstance(audio, EncodedAudioData) else audio
+
+
+def encode_samples(samples, rate):
+    """One finished utterance (16 kHz int16) -> EncodedAudioData with FLAC at `rate`"""
+    encoder = FlacStreamEncoder(rate)
+    encoder.write(samples)
+    flac = encoder.finish()
+    return EncodedAudioData(samples.astype('<i2').tobytes(), SAMPLE_RATE, 2, flac, rate)
+
+
+class UploadStats:
+    """Running totals of raw vs compressed upload size"""
+
+    def __init__(self):
+        self.utterances = 0
+        self.raw_bytes = 0
+        self.encoded_bytes = 0
+        self.finish_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, raw_bytes, encoded_bytes, finish_seconds=0.0):
+        with self._lock:
+            self.utterances += 1
+            self.raw_bytes += raw_bytes
+            self.encoded_bytes += encoded_bytes
+            self.finish_seconds += finish_seconds or 0.0
+
+    def summary(self, uplink_kbps=256):
+        """Sizes, ratio and upload seconds saved at `uplink_kbps`, all versus raw 16 kHz PCM
+
+        Not versus the old path (16 kHz FLAC encoded after capture): that
+        would mean encoding every utterance twice. `python audio_encoder.py
+        rec.wav` measures that comparison on a recording.
+        """
+        with self._lock:
+            saved = (self.raw_bytes - self.encoded_bytes) * 8 / (uplink_kbps * 1000)
+            return {
+                'utterances': self.utterances,
+                'raw_pcm_kb': round(self.raw_bytes / 1024, 1),
+                'encoded_kb': round(self.encoded_bytes / 1024, 1),
+                'ratio_vs_pcm': round(self.raw_bytes / self.encoded_bytes, 2) if self.encoded_bytes else 0.0,
+                'upload_seconds_saved_vs_pcm': round(saved, 2),
+                'mean_finish_ms': round(self.finish_seconds / self.utterances * 1000, 1) if self.utterances else 0.0,
+            }
+
+
+# One tally per process, shared by every encoder
+upload_stats = UploadStats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming FLAC encode of a WAV file vs encoding after capture")
+    parser.add_argument('wav', help="16 kHz mono 16-bit WAV")
+    parser.add_argument('--rate', type=int, default=8000, help="upload sample rate")
+    parser.add_argument('--uplink-kbps', type=float, default=128)
+    args = parser.parse_args()
+
+    with wave.open(args.wav, 'rb') as wav:
+        if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (SAMPLE_RATE, 2, 1):
+            raise SystemExit(f"{args.wav}: expected {SAMPLE_RATE} Hz 16-bit mono")
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+
+    # What recognize_google does today: FLAC of the whole utterance once it has ended
+    start = time.perf_counter()
+    after = sr.AudioData(samples.tobytes(), SAMPLE_RATE, 2).get_flac_data(convert_width=2)
+    after_ms = (time.perf_counter() - start) * 1000
+
+    # Streaming: chunks go in as they are "captured", only the tail is left at the end
+    encoder = FlacStreamEncoder(args.rate)
+    for i in range(0, len(samples), 1024):
+        encoder.write(samples[i:i + 1024])
+    streamed = encoder.finish()
+
+    raw = len(samples) * 2
+    seconds = len(samples) / SAMPLE_RATE
+
+    def upload_ms(size):
+        return size * 8 / (args.uplink_kbps * 1000) * 1000
+
+    print("=" * 60)
+    print(f"{seconds:.1f} s of audio, uplink {args.uplink_kbps:.0f} kbps")
+    print(f"  raw PCM 16 kHz      : {raw / 1024:8.1f} KB  upload {upload_ms(raw):7.0f} ms")
+    print(f"  FLAC after capture  : {len(after) / 1024:8.1f} KB  upload {upload_ms(len(after)):7.0f} ms"
+          f"  + {after_ms:.0f} ms encoding once speech ends")
+    print(f"  {f'FLAC streamed {args.rate / 1000:g} kHz':<20}: {len(streamed) / 1024:8.1f} KB"
+          f"  upload {upload_ms(len(streamed)):7.0f} ms  + {encoder.finish_seconds * 1000:.0f} ms to finish")
+    print(f"  compression {raw / len(streamed):.1f}x, saves"
+          f" {upload_ms(len(after)) + after_ms - upload_ms(len(streamed)) - encoder.finish_seconds * 1000:.0f} ms"
+          f" per utterance vs today")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Always-Open Audio Stream
+Microphone hamesha khula rehta hai aur pichhle kuch seconds ka audio ring buffer me rehta hai.
+Hotkey dabate hi recording shuru - pre-roll ki wajah se pehle shabd bhi nahi katte.
+"""
+
+import threading
+import time
+import wave
+
+try:
+    import speech_recognition as sr
+    AudioSourceBase = sr.AudioSource
+except ImportError:
+    AudioSourceBase = object
+
+try:
+    import pyaudio
+except ImportError:
+    pyaudio = None
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2      # 16-bit PCM
+CHUNK = 1024          # Frames per read, same as speech_recognition's default
+BUFFER_SECONDS = 10   # Audio kept in memory
+
+
+class AudioRingBuffer:
+    """Fixed-size ring of mono PCM bytes addressed by absolute byte position"""
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self._data = bytearray(capacity_bytes)
+        self.total = 0  # Bytes written since start (absolute write position)
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write(self, chunk):
+        with self._cond:
+            n = len(chunk)
+            if n >= self.capacity:
+                chunk = chunk[-self.capacity:]
+                self.total += n - self.capacity
+                n = self.capacity
+            start = self.total % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = chunk[:first]
+            if first < n:
+                self._data[:n - first] = chunk[first:]
+            self.total += n
+            self._cond.notify_all()
+
+    def oldest(self):
+        """Oldest absolute position still in the buffer"""
+        return max(0, self.total - self.capacity)
+
+    def read(self, position, size, timeout=None):
+        """Read `size` bytes from `position`, waiting for them to be written
+
+        Returns (data, next_position). Readers that fell out of the buffer
+        are moved forward to the oldest audio still held. Returns fewer
+        bytes only when the buffer is closed or the wait times out.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.closed or self.total >= position + size, timeout=timeout
+            )
+            position = max(position, self.oldest())
+            end = min(position + size, self.total)
+            out = bytearray()
+            while position < end:
+                start = position % self.capacity
+                take = min(end - position, self.capacity - start)
+                out += self._data[start:start + take]
+                position += take
+            return bytes(out), position
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class CaptureStream:
+    """File-like `stream` for speech_recognition, reading from the ring"""
+
+    def __init__(self, ring, position):
+        self.ring = ring
+        self.position = position
+        self.stopped = threading.Event()
+
+    def read(self, frames):
+        """Return `frames` frames of audio; b'' once stopped (ends recognizer.listen)"""
+        size = frames * SAMPLE_WIDTH
+        out = b''
+        while len(out) < size:
+            if self.stopped.is_set():
+                return b''
+            # Short timeout so a stop() is noticed quickly
+            data, self.position = self.ring.read(self.position, size - len(out), timeout=0.1)
+            out += data
+            if self.ring.closed and len(out) < size:
+                break  # Source ended
+        return out
+
+    def close(self):
+        self.stopped.set()
+
+
+class CaptureSource(AudioSourceBase):
+    """speech_recognition AudioSource that starts `preroll` seconds in the past"""
+
+    def __init__(self, ring, preroll=0.3):
+        self.SAMPLE_RATE = SAMPLE_RATE
+        self.SAMPLE_WIDTH = SAMPLE_WIDTH
+        self.CHUNK = CHUNK
+        preroll_bytes = int(preroll * SAMPLE_RATE) * SAMPLE_WIDTH
+        start = max(ring.oldest(), ring.total - preroll_bytes)
+        self.stream = CaptureStream(ring, start)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream.close()
+
+    def stop(self):
+        """End the capture; recognizer.listen returns what it has so far"""
+        self.stream.close()
+
+
+class ContinuousMicrophone:
+    """Keeps one PyAudio input stream open, feeding an AudioRingBuffer"""
+
+    def __init__(self, device_index=None, buffer_seconds=BUFFER_SECONDS):
+        self.device_index = device_index
+        self.ring = AudioRingBuffer(buffer_seconds * SAMPLE_RATE * SAMPLE_WIDTH)
+        self._audio = None
+        self._stream = None
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        self.ring.write(in_data)
+        return None, pyaudio.paContinue
+
+    def start(self):
+        if pyaudio is None:
+            raise RuntimeError("pyaudio is not installed")
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=SAMPLE_RATE,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=CHUNK,
+            stream_callback=self._callback,
+        )
+        self._stream.start_stream()
+        return self
+
+    def capture(self, preroll=0.3):
+        """New AudioSource beginning `preroll` seconds before now"""
+        return CaptureSource(self.ring, preroll)
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+        self.ring.close()
+
+
+class WavFileSource:
+    """Feeds a 16 kHz mono 16-bit WAV file into a ring like a live microphone
+
+    Used for benchmarks and offline replays. `realtime=False` pushes the
+    audio as fast as possible; the buffer then holds the whole file so a
+    slower reader loses nothing.
+    """
+
+    def __init__(self, path, realtime=True, buffer_seconds=BUFFER_SECONDS, loop=False):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        if not realtime and not loop:
+            with wave.open(path, 'rb') as wav:
+                buffer_seconds = max(buffer_seconds, int(wav.getnframes() / SAMPLE_RATE) + 1)
+        self.ring = AudioRingBuffer(buffer_seconds * SAMPLE_RATE * SAMPLE_WIDTH)
+        self._stop = threading.Event()
+        self.finished = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        chunk_seconds = CHUNK / SAMPLE_RATE
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            with wave.open(self.path, 'rb') as wav:
+                if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (SAMPLE_RATE, SAMPLE_WIDTH, 1):
+                    raise ValueError(f"{self.path}: expected {SAMPLE_RATE} Hz 16-bit mono")
+                while not self._stop.is_set():
+                    data = wav.readframes(CHUNK)
+                    if not data:
+                        break
+                    self.ring.write(data)
+                    if self.realtime:
+                        next_time += chunk_seconds
+                        delay = next_time - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+            if not self.loop:
+                break
+        self.finished.set()
+        self.ring.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="WavFileSource", daemon=True)
+        self._thread.start()
+        return self
+
+    def capture(self, preroll=0.3):
+        return CaptureSource(self.ring, preroll)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.ring.close()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Auto Language (English + Hindi)
+Har phrase dono languages me ek saath recognize hota hai aur jiska confidence zyada ho
+woh rakha jaata hai - haath se Ctrl+Shift+L dabane ki zarurat nahi. User zyadatar ek hi
+bhasha bolta ho (prior strong) to sirf usi me ek request jaati hai.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import speech_recognition as sr
+
+UNKNOWN_CONFIDENCE = 0.5   # For engines that report none
+
+
+class LanguagePriors:
+    """Running share of each language in what this user actually says
+
+    Saved in config.json ('language_priors') so it carries over sessions.
+    """
+
+    def __init__(self, languages, priors=None, decay=0.9):
+        self.languages = list(languages)
+        self.decay = decay
+        even = 1.0 / len(self.languages)
+        priors = priors or {}
+        self.priors = {lang: float(priors.get(lang, even)) for lang in self.languages}
+        self._lock = threading.Lock()
+
+    def update(self, language):
+        with self._lock:
+            for lang in self.languages:
+                target = 1.0 if lang == language else 0.0
+                self.priors[lang] = self.decay * self.priors[lang] + (1 - self.decay) * target
+
+    def dominant(self, threshold):
+        """The language with a prior of at least `threshold`, else None"""
+        with self._lock:
+            lang = max(self.priors, key=self.priors.get)
+            return lang if self.priors[lang] >= threshold else None
+
+    def ranked(self):
+        with self._lock:
+            return sorted(self.languages, key=self.priors.get, reverse=True)
+
+    @classmethod
+    def from_config(cls, config, languages):
+        return cls(languages, config.get('language_priors'))
+
+    def save_to(self, config):
+        config['language_priors'] = {lang: round(p, 3) for lang, p in self.priors.items()}
+
+
+class AutoLanguageRecognizer:
+    """Picks the language per utterance by recognition confidence
+
+    With a strong prior only that language is tried; a low-confidence
+    answer then falls back to the others. Otherwise all languages run
+    concurrently (latency of one request) and a result at or above
+    `accept_confidence` is taken without waiting for the rest.
+    """
+
+    def __init__(self, engine, priors, strong_prior=0.85, min_confidence=0.6,
+                 accept_confidence=0.9):
+        self.engine = engine
+        self.priors = priors
+        self.strong_prior = strong_prior
+        self.min_confidence = min_confidence
+        self.accept_confidence = accept_confidence
+        self.executor = ThreadPoolExecutor(max_workers=4 * len(priors.languages),
+                                           thread_name_prefix="AutoLanguage")
+        self.single_requests = 0
+        self.parallel_requests = 0
+
+    def _attempt(self, audio, language):
+        text, confidence = self.engine.recognize_with_confidence(audio, language)
+        return text, UNKNOWN_CONFIDENCE if confidence is None else confidence, language
+
+    def recognize(self, audio):
+        """(text, language) for `audio`; raises sr.UnknownValueError if no language fits"""
+        order = self.priors.ranked()
+        languages = order
+        likely = self.priors.dominant(self.strong_prior)
+        if likely:
+            self.single_requests += 1
+            try:
+                text, confidence, language = self._attempt(audio, likely)
+                if confidence >= self.min_confidence:
+                    self.priors.update(language)
+                    return text, language
+                results = [(text, confidence, language)]
+            except sr.UnknownValueError:
+                results = []
+            languages = [lang for lang in languages if lang != likely]
+        else:
+            results = []
+        results += self._race(audio, languages)
+
+        if not results:
+            raise sr.UnknownValueError()
+        # Ties go to the language this user speaks more
+        text, _, language = max(results, key=lambda r: (r[1], -order.index(r[2])))
+        self.priors.update(language)
+        return text, language
+
+    def _race(self, audio, languages):
+        """Run `languages` concurrently; stop early on a confident answer"""
+        if not languages:
+            return []
+        self.parallel_requests += 1
+        pending = {self.executor.submit(self._attempt, audio, lang) for lang in languages}
+        results = []
+        errors = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    results.append(future.result())
+                except sr.UnknownValueError:
+                    pass
+                except sr.RequestError as e:
+                    errors.append(e)
+            if any(confidence >= self.accept_confidence for _, confidence, _ in results):
+                break   # The slower language cannot matter any more
+        if not results and errors:
+            raise errors[0]
+        return results
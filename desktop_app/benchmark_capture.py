@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capture Latency Benchmark
+Synthetic WAV ko "microphone" bana kar naapa jaata hai ki hotkey dabane ke kitni der baad
+audio milna shuru hota hai, aur pre-roll me hotkey se pehle ka audio aaya ya nahi.
+
+Usage:
+    python benchmark_capture.py --runs 10
+"""
+
+import argparse
+import math
+import os
+import statistics
+import tempfile
+import time
+import wave
+from array import array
+
+from audio_stream import SAMPLE_RATE, CHUNK, WavFileSource
+
+HOTKEY_AT = 1.0      # Seconds into the file when the "hotkey" is pressed
+SPEECH_START = 0.8   # Tone (the "first word") starts slightly before the hotkey
+PREROLL = 0.3
+
+
+def write_synthetic_wav(path, seconds=3.0):
+    """Silence, then a 440 Hz tone from SPEECH_START onwards"""
+    samples = array('h')
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        value = 8000 * math.sin(2 * math.pi * 440 * t) if t >= SPEECH_START else 0
+        samples.append(int(value))
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+
+
+def rms(data):
+    samples = array('h', data)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def run_once(path):
+    """Returns (hotkey->first audio latency in s, seconds of speech caught before the hotkey)"""
+    source = WavFileSource(path, realtime=True).start()
+    time.sleep(HOTKEY_AT)
+
+    pressed = time.perf_counter()
+    with source.capture(preroll=PREROLL) as capture:
+        first = capture.stream.read(CHUNK)
+        latency = time.perf_counter() - pressed
+
+        # Count how much tone arrived in the pre-roll part of the capture
+        preroll_audio = first
+        while len(preroll_audio) < int(PREROLL * SAMPLE_RATE) * 2:
+            preroll_audio += capture.stream.read(CHUNK)
+    source.stop()
+
+    voiced = 0
+    frame = 160 * 2  # 10 ms
+    preroll_audio = preroll_audio[:int(PREROLL * SAMPLE_RATE) * 2]
+    for i in range(0, len(preroll_audio), frame):
+        if rms(preroll_audio[i:i + frame]) > 1000:
+            voiced += 0.01
+    return latency, voiced
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotkey-to-capture latency with pre-roll")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix='.wav')
+    os.close(fd)
+    try:
+        write_synthetic_wav(path)
+        latencies = []
+        caught = []
+        for _ in range(args.runs):
+            latency, voiced = run_once(path)
+            latencies.append(latency * 1000)
+            caught.append(voiced)
+
+        print("=" * 60)
+        print(f"Hotkey -> first audio : median {statistics.median(latencies):.2f} ms,"
+              f" max {max(latencies):.2f} ms")
+        print(f"Speech before hotkey  : {statistics.median(caught):.2f} s recovered by pre-roll"
+              f" (expected {HOTKEY_AT - SPEECH_START:.2f} s)")
+        print("Old path (new Microphone + 0.5 s calibration) lost >= 500 ms per recording")
+        print("=" * 60)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text Injection Benchmark
+Har backend kitne characters/second type karta hai - ek Tk text box me type karke naapa jaata hai.
+
+Usage (headless Linux):
+    python benchmark_injection.py --xvfb
+Usage (real desktop):
+    python benchmark_injection.py --chars 500
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import threading
+import time
+import tkinter as tk
+
+SAMPLE = "The quick brown fox jumps over the lazy dog 0123456789. "
+
+
+def start_xvfb(display=':99'):
+    """Start a virtual X display and point DISPLAY at it"""
+    if not shutil.which('Xvfb'):
+        raise SystemExit("Xvfb not installed (apt install xvfb)")
+    process = subprocess.Popen(
+        ['Xvfb', display, '-screen', '0', '1280x800x24'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.environ['DISPLAY'] = display
+    time.sleep(1.0)
+    return process
+
+
+def measure(backend, text, timeout=60.0):
+    """Type `text` into a fresh focused Text widget; returns chars/second"""
+    root = tk.Tk()
+    root.geometry("800x400+0+0")
+    box = tk.Text(root)
+    box.pack(fill='both', expand=True)
+    root.update()
+    root.focus_force()
+    box.focus_set()
+    root.update()
+
+    result = {}
+
+    def worker():
+        result['start'] = time.perf_counter()
+        try:
+            backend.inject(text)
+        except Exception as e:
+            result['error'] = e
+
+    threading.Thread(target=worker, daemon=True).start()
+
+    deadline = time.perf_counter() + timeout
+    received = 0
+    while time.perf_counter() < deadline and 'error' not in result:
+        root.update()
+        received = len(box.get('1.0', 'end-1c'))
+        if received >= len(text):
+            break
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - result.get('start', time.perf_counter())
+    root.destroy()
+
+    if 'error' in result:
+        raise result['error']
+    if received < len(text):
+        raise TimeoutError(f"only {received}/{len(text)} characters arrived")
+    return len(text) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Characters/second per injection backend")
+    parser.add_argument('--chars', type=int, default=200)
+    parser.add_argument('--xvfb', action='store_true', help="run on a virtual X display")
+    args = parser.parse_args()
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        # Import after DISPLAY is set: pyautogui connects to X on import
+        from text_injection import BACKENDS
+
+        text = (SAMPLE * (args.chars // len(SAMPLE) + 1))[:args.chars]
+        print("=" * 60)
+        print(f"Injection benchmark: {len(text)} characters")
+        print("=" * 60)
+        for backend in BACKENDS:
+            if not backend.available():
+                print(f"{backend.name:<10}  (not available)")
+                continue
+            try:
+                cps = measure(backend, text)
+                print(f"{backend.name:<10}  {cps:10.0f} chars/s")
+            except Exception as e:
+                print(f"{backend.name:<10}  failed: {e}")
+        print("=" * 60)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+
+if __name__ == '__main__':
+    main()
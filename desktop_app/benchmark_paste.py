@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Paste Timing Harness
+Purana paste (copy -> fixed sleep -> Ctrl+V) vs naya PasteTransaction.
+Text box me text dikhne tak ka time naapa jaata hai.
+
+Usage:
+    python benchmark_paste.py --runs 20
+    python benchmark_paste.py --runs 20 --xvfb     (headless Linux, xclip chahiye)
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmark_injection import measure, start_xvfb
+
+TEXT = "नमस्ते, this is a paste timing test."
+
+
+class LegacyPaste:
+    """The old server path: copy, sleep 0.2 s, Ctrl+V"""
+
+    name = 'legacy (fixed 200 ms)'
+
+    def inject(self, text):
+        import pyautogui
+        import pyperclip
+        pyperclip.copy(text)
+        time.sleep(0.2)
+        pyautogui.hotkey('ctrl', 'v')
+
+
+class TransactionPaste:
+    """PasteTransaction: confirm by polling, no fixed sleep"""
+
+    name = 'transaction'
+
+    def __init__(self):
+        from clipboard_paste import PasteTransaction
+        self.transaction = PasteTransaction()
+        self.internal = []
+
+    def inject(self, text):
+        self.internal.append(self.transaction.paste(text))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paste latency: legacy vs transaction")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--xvfb', action='store_true', help="run on a virtual X display")
+    args = parser.parse_args()
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        print("=" * 60)
+        print(f"Paste timing: {args.runs} runs, '{TEXT}'")
+        print("=" * 60)
+        for method in (LegacyPaste(), TransactionPaste()):
+            latencies = []
+            for _ in range(args.runs):
+                cps = measure(method, TEXT, timeout=5.0)
+                latencies.append(len(TEXT) / cps * 1000)
+            latencies.sort()
+            print(f"{method.name:<24} median {statistics.median(latencies):7.1f} ms"
+                  f"   max {latencies[-1]:7.1f} ms")
+            if isinstance(method, TransactionPaste):
+                clipboard = [t['clipboard_ms'] for t in method.internal]
+                print(f"{'  clipboard set+confirm':<24} median {statistics.median(clipboard):7.1f} ms")
+        print("=" * 60)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline Pipeline Benchmark
+Mic aur Google ke bina poori pipeline ka benchmark: WAV files nakli microphone
+(WavFileSource) se -> VAD/segmentation -> stub ya offline recognizer -> khaali output.
+Real-time factor, har stage ke p50/p90/p99, peak memory aur throughput; results JSON me
+save karke do runs compare kar sakte hain (headless Linux par bhi chalta hai).
+
+Usage:
+    python benchmark_pipeline.py                                   (synthetic corpus, stub)
+    python benchmark_pipeline.py corpus/ --engine vosk --json run.json
+    python benchmark_pipeline.py --json new.json --compare old.json   (regression check)
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+import vad
+from audio_stream import SAMPLE_RATE, WavFileSource
+from benchmark_vad import synthetic_fixture
+from dictation_pipeline import DictationPipeline
+from latency_trace import LatencyTracer
+from recognition_engines import StubEngine, create_engine
+
+# Metric -> True if bigger is better (used by --compare)
+COMPARED = {
+    'rtf': False,
+    'utterances_per_second': True,
+    'utterance_p99_ms': False,
+    'peak_rss_mb': False,
+}
+
+
+def write_synthetic_corpus(directory, files, seconds):
+    """Seeded labelled fixtures as WAV files; returns [(path, expected utterances)]"""
+    corpus = []
+    for index in range(files):
+        samples, labels = synthetic_fixture(seconds, seed=index + 1)
+        path = os.path.join(directory, f"synthetic_{index + 1:02d}.wav")
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLE_RATE)
+            wav.writeframes(samples.tobytes())
+        corpus.append((path, len(labels)))
+    return corpus
+
+
+def find_wavs(paths):
+    """WAV files named directly or found in the given directories, in sorted order"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(glob.glob(os.path.join(path, '**', '*.wav'), recursive=True)))
+        else:
+            found.append(path)
+    for path in found:
+        with wave.open(path, 'rb') as wav:
+            if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (SAMPLE_RATE, 2, 1):
+                raise SystemExit(f"{path}: expected {SAMPLE_RATE} Hz 16-bit mono")
+    return [(path, None) for path in found]
+
+
+def wav_seconds(path):
+    with wave.open(path, 'rb') as wav:
+        return wav.getnframes() / wav.getframerate()
+
+
+class TimedSegmenter(vad.UtteranceSegmenter):
+    """Segmenter that times its VAD work and stamps each utterance it emits"""
+
+    def __init__(self, tracer, emitted, **options):
+        super().__init__(vad.Endpointer(vad.VoiceActivityDetector(), **options))
+        self.tracer = tracer
+        self.emitted = emitted   # id(utterance) -> perf_counter when it left the segmenter
+
+    def _stamp(self, utterances):
+        now = time.perf_counter()
+        for utterance in utterances:
+            self.emitted[id(utterance)] = now
+        return utterances
+
+    def feed(self, samples):
+        with self.tracer.span('vad'):
+            utterances = super().feed(samples)
+        return self._stamp(utterances)
+
+    def flush(self):
+        return self._stamp(super().flush())
+
+
+def run_file(path, engine, args, tracer):
+    """One WAV through the whole pipeline; returns this file's results"""
+    emitted = {}
+    texts = []
+
+    def recognize(samples):
+        started = time.perf_counter()
+        tracer.record('queue_wait', started - emitted.get(id(samples), started))
+        audio = sr.AudioData(samples.astype('<i2').tobytes(), SAMPLE_RATE, 2)
+        try:
+            with tracer.span('recognition'):
+                text = engine.recognize(audio, args.language)
+        except sr.UnknownValueError:
+            return None
+        return text, emitted.pop(id(samples), started)
+
+    def output(result):
+        text, segmented_at = result
+        with tracer.span('output'):
+            texts.append(text)   # The sink: nothing is typed
+        tracer.record('utterance', time.perf_counter() - segmented_at)
+
+    source = WavFileSource(path, realtime=args.realtime)
+    capture = source.capture(preroll=0)   # Before start, so it begins at the first sample
+    segmenter = TimedSegmenter(tracer, emitted, end_silence_ms=args.end_silence_ms)
+    pipeline = DictationPipeline(capture, recognize, output, segmenter, workers=args.workers)
+
+    start = time.perf_counter()
+    source.start()
+    pipeline.start()
+    pipeline.join()
+    elapsed = time.perf_counter() - start
+    source.stop()
+    return {
+        'file': os.path.basename(path),
+        'audio_seconds': round(wav_seconds(path), 3),
+        'wall_seconds': round(elapsed, 3),
+        'utterances': len(texts),
+        'stages': pipeline.stats(),
+    }
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == 'darwin' else 1), 1)   # macOS: bytes
+
+
+def run_benchmark(corpus, engine, args):
+    tracer = LatencyTracer(keep=1)
+    if args.trace_memory:
+        tracemalloc.start()   # Python-level peak, but slows everything down
+    files = []
+    for _ in range(args.repeat):
+        for path, expected in corpus:
+            result = run_file(path, engine, args, tracer)
+            if expected is not None:
+                result['expected_utterances'] = expected
+            files.append(result)
+            print(f"  {result['file']:<28} {result['audio_seconds']:>7.1f} s audio"
+                  f" {result['wall_seconds']:>7.2f} s wall {result['utterances']:>4} utterances")
+    traced_peak = None
+    if args.trace_memory:
+        traced_peak = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+    audio = sum(f['audio_seconds'] for f in files)
+    wall = sum(f['wall_seconds'] for f in files)
+    utterances = sum(f['utterances'] for f in files)
+    stages = tracer.summary()
+    return {
+        'summary': {
+            'files': len(files),
+            'audio_seconds': round(audio, 3),
+            'wall_seconds': round(wall, 3),
+            'rtf': round(wall / audio, 5) if audio else None,
+            'utterances': utterances,
+            'utterances_per_second': round(utterances / wall, 2) if wall else None,
+            'audio_seconds_per_second': round(audio / wall, 1) if wall else None,
+            'utterance_p99_ms': stages.get('utterance', {}).get('p99_ms'),
+            'peak_traced_mb': traced_peak,
+            'peak_rss_mb': peak_rss_mb(),
+        },
+        'stages': stages,
+        'files': files,
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    """Print changes against a saved run; True if nothing got worse by more than `tolerance`"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['summary']
+    ok = True
+    print(f"Compared with {baseline_path} (tolerance {tolerance:.0%}):")
+    for key, higher_is_better in COMPARED.items():
+        old, new = baseline.get(key), results['summary'].get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = 'REGRESSION' if worse > tolerance else 'ok'
+        ok = ok and worse <= tolerance
+        print(f"  {key:<24} {old:>10} -> {new:<10} ({change:+.1%}) {flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of capture -> VAD -> recognition -> output")
+    parser.add_argument('corpus', nargs='*', help="WAV files or directories (default: synthetic corpus)")
+    parser.add_argument('--files', type=int, default=4, help="synthetic corpus: number of files")
+    parser.add_argument('--seconds', type=int, default=60, help="synthetic corpus: length of each file")
+    parser.add_argument('--engine', default='stub', help="stub, vosk, whisper (offline engines need models)")
+    parser.add_argument('--latency-ms', type=float, default=50, help="stub recognizer latency")
+    parser.add_argument('--language', default='en-US')
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--end-silence-ms', type=int, default=200)
+    parser.add_argument('--realtime', action='store_true', help="play files at 1x like a live microphone")
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--trace-memory', action='store_true', help="also measure peak with tracemalloc")
+    parser.add_argument('--json', help="write results here")
+    parser.add_argument('--compare', help="results JSON of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.engine == 'stub':
+        engine = StubEngine(latency=args.latency_ms / 1000, seed=1)
+    else:
+        engine = create_engine(args.engine)
+        if engine is None or not engine.available():
+            raise SystemExit(f"Engine '{args.engine}' is unknown or not installed")
+        engine.load()
+
+    directory = None
+    if args.corpus:
+        corpus = find_wavs(args.corpus)
+    else:
+        directory = tempfile.mkdtemp(prefix='voice-corpus-')
+        corpus = write_synthetic_corpus(directory, args.files, args.seconds)
+
+    print("=" * 60)
+    print(f"{len(corpus)} file(s) x {args.repeat}, engine {engine.name}, {args.workers} workers,"
+          f" {'real time' if args.realtime else 'as fast as possible'}")
+    try:
+        results = run_benchmark(corpus, engine, args)
+    finally:
+        if directory:
+            shutil.rmtree(directory)
+
+    results['run'] = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'options': {k: v for k, v in vars(args).items() if k not in ('json', 'compare')},
+    }
+
+    s = results['summary']
+    print("-" * 60)
+    print(f"Real-time factor : {s['rtf']:.4f}  ({s['audio_seconds_per_second']:,.0f}x real time)")
+    print(f"Throughput       : {s['utterances_per_second']} utterances/s ({s['utterances']} total)")
+    print(f"Peak memory      : {s['peak_rss_mb']} MB RSS"
+          + (f", {s['peak_traced_mb']} MB traced" if s['peak_traced_mb'] is not None else ''))
+    print(f"{'stage':<12} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for stage, h in results['stages'].items():
+        print(f"{stage:<12} {h['count']:>7} {h['p50_ms']:>9.2f} {h['p90_ms']:>9.2f} {h['p99_ms']:>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+    ok = compare(results, args.compare, args.tolerance) if args.compare else True
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
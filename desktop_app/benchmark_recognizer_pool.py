@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recognizer Pool Benchmark
+Stub recognizer (nakli network latency) se naapa jaata hai ki 1, 2, 4, 8 workers par
+kitne utterances/second recognize hote hain, aur result order sahi rehta hai ya nahi.
+
+Usage:
+    python benchmark_recognizer_pool.py --utterances 40 --latency-ms 300
+    python benchmark_recognizer_pool.py --processes --cpu-ms 50     (CPU-bound offline engine)
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from recognizer_pool import RecognizerPool
+
+
+def stub_recognize(job):
+    """Pretend recognizer: waits like a network call and/or burns CPU like a local model"""
+    index, latency, cpu = job
+    time.sleep(latency)
+    deadline = time.perf_counter() + cpu
+    while time.perf_counter() < deadline:
+        pass
+    return f"utterance {index}"
+
+
+def run(workers, jobs, processes):
+    results = []
+    done = threading.Event()
+
+    def deliver(text):
+        results.append(text)
+        if len(results) == len(jobs):
+            done.set()
+
+    pool = RecognizerPool(stub_recognize, deliver, workers=workers, processes=processes)
+    start = time.perf_counter()
+    for job in jobs:
+        pool.submit(job)
+    done.wait()
+    elapsed = time.perf_counter() - start
+    max_waiting = pool.ordered.max_waiting
+    pool.close()
+    in_order = results == [f"utterance {index}" for index, _, _ in jobs]
+    return elapsed, in_order, max_waiting
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel recognition throughput with a stub recognizer")
+    parser.add_argument('--utterances', type=int, default=40)
+    parser.add_argument('--latency-ms', type=float, default=300, help="mean stub latency per utterance")
+    parser.add_argument('--jitter', type=float, default=0.5, help="latency varies by +/- this fraction")
+    parser.add_argument('--cpu-ms', type=float, default=0, help="CPU time burned per utterance")
+    parser.add_argument('--processes', action='store_true', help="process pool instead of threads")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    jobs = []
+    for index in range(args.utterances):
+        latency = args.latency_ms / 1000 * (1 + rng.uniform(-args.jitter, args.jitter))
+        jobs.append((index, latency, args.cpu_ms / 1000))
+
+    print("=" * 60)
+    print(f"{args.utterances} utterances, ~{args.latency_ms:.0f} ms latency,"
+          f" {args.cpu_ms:.0f} ms CPU, {'processes' if args.processes else 'threads'}")
+    baseline = None
+    for workers in args.workers:
+        elapsed, in_order, max_waiting = run(workers, jobs, args.processes)
+        baseline = baseline or elapsed
+        print(f"  {workers:>2} workers: {args.utterances / elapsed:6.1f} utt/s"
+              f"  ({baseline / elapsed:4.1f}x)  order {'OK' if in_order else 'BROKEN'}"
+              f"  (max {max_waiting} held back)")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recognition Resilience Check
+Nakli recognizer (kabhi fail, kabhi bahut slow) par seedhi call aur ResilientEngine ki
+tulna: kitne phrases bache aur latency p50/p99. Phir service "down" karke spool me audio
+jaata hai aur "up" hote hi wapas recognize hota hai.
+
+Usage:
+    python benchmark_resilience.py --utterances 200 --failure-rate 0.1 --tail-rate 0.05
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+from recognition_engines import StubEngine
+from resilient_recognition import RecognitionSpool, ResilientEngine
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def utterance(index):
+    return sr.AudioData(index.to_bytes(4, 'little') * 4000, 16000, 2)
+
+
+def run(engine, count, concurrency=8):
+    """Returns (succeeded, latencies of the successful calls)"""
+    def one(index):
+        start = time.perf_counter()
+        try:
+            engine.recognize(utterance(index), 'en-US')
+            return time.perf_counter() - start
+        except sr.RequestError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(count)))
+    latencies = [r for r in results if r is not None]
+    return len(latencies), latencies
+
+
+def report(label, count, succeeded, latencies):
+    if latencies:
+        print(f"  {label:<10}: {succeeded}/{count} recognized,"
+              f" p50 {statistics.median(latencies) * 1000:.0f} ms,"
+              f" p99 {percentile(latencies, 0.99) * 1000:.0f} ms")
+    else:
+        print(f"  {label:<10}: 0/{count} recognized")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retries, hedging and spool against a flaky fake recognizer")
+    parser.add_argument('--utterances', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=100)
+    parser.add_argument('--failure-rate', type=float, default=0.1)
+    parser.add_argument('--tail-rate', type=float, default=0.05)
+    parser.add_argument('--tail-ms', type=float, default=3000)
+    args = parser.parse_args()
+
+    def flaky(seed=42):
+        return StubEngine(latency=args.latency_ms / 1000, failure_rate=args.failure_rate,
+                          tail_rate=args.tail_rate, tail_latency=args.tail_ms / 1000, seed=seed)
+
+    print("=" * 60)
+    print(f"Fake recognizer: {args.latency_ms:.0f} ms, {args.failure_rate:.0%} failures,"
+          f" {args.tail_rate:.0%} take {args.tail_ms:.0f} ms")
+    report('direct', args.utterances, *run(flaky(), args.utterances))
+    # Hedges go to a second, independently flaky backend
+    resilient = ResilientEngine(flaky(), flaky(seed=43), deadline=8.0, attempt_timeout=4.0, hedge_after=0.3)
+    report('resilient', args.utterances, *run(resilient, args.utterances))
+    print(f"  counters  : {resilient.stats()}")
+
+    # Outage: everything goes to the spool, then drains once the service is back
+    directory = tempfile.mkdtemp(prefix='spool-')
+    try:
+        engine = StubEngine()
+        engine.down = True
+        recovered = []
+        spool = RecognitionSpool(engine.recognize, lambda text, language, ts: recovered.append(text),
+                                 directory=directory)
+        for index in range(10):
+            try:
+                engine.recognize(utterance(index), 'en-US')
+            except sr.RequestError:
+                spool.add(utterance(index), 'en-US')
+        print(f"  outage    : {len(spool.pending())} utterances spooled,"
+              f" drain while down -> {'ok' if spool.drain() else 'still down'}")
+        engine.down = False
+        spool.drain()
+        print(f"  recovery  : {len(recovered)} recovered, {len(spool.pending())} left in spool")
+    finally:
+        shutil.rmtree(directory)
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
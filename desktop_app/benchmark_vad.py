@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VAD Benchmark + Accuracy Check
+Ek ghante ka audio kitni jaldi process hota hai (x real-time), aur labelled audio par
+frame accuracy aur utterance boundary kitne sahi hain.
+
+Usage:
+    python benchmark_vad.py                           (synthetic labelled fixture)
+    python benchmark_vad.py --wav rec.wav --labels rec.csv
+        rec.csv: har line "start_seconds,end_seconds" ek bola hua hissa
+"""
+
+import argparse
+import time
+import wave
+
+import numpy as np
+
+from vad import FRAME_SAMPLES, SAMPLE_RATE, Endpointer, VoiceActivityDetector, segment
+
+
+def synthetic_fixture(seconds=60, seed=7):
+    """Labelled audio: quiet room noise, voiced 'words', fricatives, loud noise bursts
+
+    Returns (int16 samples, list of (start_s, end_s) speech spans).
+    """
+    rng = np.random.default_rng(seed)
+    total = seconds * SAMPLE_RATE
+    audio = rng.normal(0, 60, total)          # Background hiss
+    labels = []
+    t = 0.5
+    while t < seconds - 3:
+        # An utterance: a few syllables with short gaps
+        start = t
+        for _ in range(rng.integers(2, 6)):
+            length = rng.uniform(0.15, 0.4)
+            n = int(length * SAMPLE_RATE)
+            i = int(t * SAMPLE_RATE)
+            f0 = rng.uniform(110, 230)
+            x = np.arange(n) / SAMPLE_RATE
+            voiced = sum(np.sin(2 * np.pi * f0 * k * x) / k for k in range(1, 8))
+            envelope = np.sin(np.pi * np.arange(n) / n) ** 0.5
+            audio[i:i + n] += 3000 * voiced * envelope
+            t += length + rng.uniform(0.03, 0.12)
+        labels.append((start, t))
+        # Pause, sometimes with a loud non-speech noise burst (fan, keyboard)
+        pause = rng.uniform(0.6, 1.5)
+        if rng.random() < 0.3:
+            i = int((t + 0.2) * SAMPLE_RATE)
+            audio[i:i + int(0.2 * SAMPLE_RATE)] += rng.normal(0, 1500, int(0.2 * SAMPLE_RATE))
+        t += pause
+    return np.clip(audio, -32768, 32767).astype(np.int16), labels
+
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wav:
+        if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (SAMPLE_RATE, 2, 1):
+            raise SystemExit(f"{path}: expected {SAMPLE_RATE} Hz 16-bit mono")
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+
+
+def load_labels(path):
+    spans = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                start, end = line.split(',')[:2]
+                spans.append((float(start), float(end)))
+    return spans
+
+
+def label_mask(labels, frames):
+    mask = np.zeros(frames, dtype=bool)
+    for start, end in labels:
+        mask[int(start * SAMPLE_RATE) // FRAME_SAMPLES:int(end * SAMPLE_RATE) // FRAME_SAMPLES] = True
+    return mask
+
+
+def accuracy(samples, labels):
+    """Frame accuracy of the raw VAD and boundary error of the endpointed segments"""
+    detector = VoiceActivityDetector()
+    decisions = detector.classify(samples)
+    truth = label_mask(labels, len(decisions))
+    frame_acc = float(np.mean(decisions == truth))
+    missed = float(np.mean(~decisions[truth])) if truth.any() else 0.0
+
+    segments = [(s / SAMPLE_RATE, e / SAMPLE_RATE) for s, e in segment(samples)]
+    matched = 0
+    end_errors = []
+    for start, end in labels:
+        overlapping = [seg for seg in segments if seg[0] < end and seg[1] > start]
+        if overlapping:
+            matched += 1
+            end_errors.append(abs(max(seg[1] for seg in overlapping) - end))
+    return frame_acc, missed, len(segments), matched, end_errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy VAD speed and accuracy")
+    parser.add_argument('--wav', help="16 kHz mono WAV (default: synthetic fixture)")
+    parser.add_argument('--labels', help="CSV of speech spans for --wav")
+    parser.add_argument('--hours', type=float, default=1.0, help="audio length for the speed test")
+    args = parser.parse_args()
+
+    if args.wav:
+        samples = load_wav(args.wav)
+        labels = load_labels(args.labels) if args.labels else None
+    else:
+        samples, labels = synthetic_fixture()
+
+    print("=" * 60)
+    # Speed: loop the recording up to the requested length, streamed in 10 s blocks
+    target = int(args.hours * 3600 * SAMPLE_RATE)
+    block = 10 * SAMPLE_RATE
+    endpointer = Endpointer()
+    utterances = 0
+    position = 0
+    start = time.perf_counter()
+    while position < target:
+        offset = position % len(samples)
+        chunk = samples[offset:offset + min(block, target - position)]
+        utterances += sum(1 for kind, _ in endpointer.process(chunk) if kind == 'start')
+        position += len(chunk)
+    elapsed = time.perf_counter() - start
+    audio_seconds = target / SAMPLE_RATE
+    print(f"Processed {audio_seconds / 3600:.2f} h of audio in {elapsed:.2f} s"
+          f"  ->  {audio_seconds / elapsed:,.0f}x real time ({utterances} utterances)")
+
+    if labels:
+        frame_acc, missed, found, matched, end_errors = accuracy(samples, labels)
+        print(f"Frame accuracy      : {frame_acc * 100:.1f}%  (speech frames missed {missed * 100:.1f}%)")
+        print(f"Utterances          : {matched}/{len(labels)} labelled found, {found} detected")
+        if end_errors:
+            print(f"End boundary error  : median {np.median(end_errors) * 1000:.0f} ms,"
+                  f" max {max(end_errors) * 1000:.0f} ms")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
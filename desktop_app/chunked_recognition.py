@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chunked Recognition for Long Dictation
+Lamba bolna VAD ke pauses par chhote, thode overlapping windows me kat-ta hai. Har window
+alag recognize hoti hai aur overlap wale repeat shabd hata kar text jodte jaate hain -
+text bolte-bolte aata hai, 15 s ki limit nahi, aur memory me sirf ek window rehti hai.
+"""
+
+import numpy as np
+
+from recognizer_pool import RecognizerPool
+from vad import FRAME_MS, FRAME_SAMPLES, VoiceActivityDetector
+
+PUNCTUATION = '.,!?;:"\'।'
+
+
+class ChunkWindower:
+    """Cuts a live int16 stream into overlapping windows at speech pauses
+
+    A window is closed at the first pause of `pause_ms` after `min_window_s`
+    (cut in the middle of the pause), or at the quietest frame of the last
+    second once `max_window_s` is reached. The next window starts
+    `overlap_s` before the cut. Windows without new speech are dropped.
+    `peek()` hands out the still-open window for a provisional hypothesis.
+    """
+
+    def __init__(self, vad=None, min_window_s=2.0, max_window_s=8.0, overlap_s=0.5, pause_ms=160):
+        self.vad = vad or VoiceActivityDetector()
+        self.min_frames = int(min_window_s * 1000 // FRAME_MS)
+        self.max_frames = int(max_window_s * 1000 // FRAME_MS)
+        self.overlap_frames = int(overlap_s * 1000 // FRAME_MS)
+        self.pause_frames = max(1, pause_ms // FRAME_MS)
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._audio = np.zeros(0, dtype=np.int16)    # Whole frames of the open window
+        self._speech = np.zeros(0, dtype=bool)
+        self._rms = np.zeros(0, dtype=np.float32)
+        self._fresh_from = 0                         # Frames before this were already sent
+        self._peeked = 0                             # Window length at the last peek
+
+    def feed(self, samples):
+        """Feed int16 samples; returns finished windows (int16 arrays)"""
+        samples = np.concatenate([self._pending, samples]) if len(self._pending) else samples
+        usable = len(samples) - len(samples) % FRAME_SAMPLES
+        self._pending = samples[usable:]
+        if usable:
+            block = samples[:usable]
+            frames = block.astype(np.float32).reshape(-1, FRAME_SAMPLES)
+            self._audio = np.concatenate([self._audio, block])
+            self._speech = np.concatenate([self._speech, self.vad.classify(block)])
+            self._rms = np.concatenate([self._rms, np.sqrt(np.mean(frames * frames, axis=1))])
+
+        windows = []
+        cut = self._find_cut()
+        while cut is not None:
+            window = self._take(cut)
+            if window is not None:
+                windows.append(window)
+            cut = self._find_cut()
+        return windows
+
+    def flush(self):
+        """The rest of the stream as a last window (if it holds new speech)"""
+        window = self._take(len(self._speech))
+        self._pending = np.zeros(0, dtype=np.int16)
+        return [window] if window is not None else []
+
+    def peek(self, grown_s=1.0):
+        """The open window so far, once it has grown `grown_s` since the last peek
+
+        None while it has not, or when it holds no new speech yet.
+        """
+        frames = len(self._speech)
+        if frames - self._peeked < grown_s * 1000 // FRAME_MS:
+            return None
+        self._peeked = frames
+        if not self._speech[self._fresh_from:].any():
+            return None
+        return self._audio.copy()
+
+    def _find_cut(self):
+        frames = len(self._speech)
+        if frames < self.min_frames:
+            return None
+        # Pauses after the minimum length, as runs of non-speech frames
+        region = ~self._speech[self.min_frames:]
+        edges = np.flatnonzero(np.diff(np.concatenate([[False], region, [False]]).astype(np.int8)))
+        for start, end in zip(edges[::2], edges[1::2]):
+            if end - start >= self.pause_frames:
+                return self.min_frames + int(start + end) // 2
+        if frames >= self.max_frames:
+            # No pause: cut where it is quietest, hopefully between words
+            low = self.max_frames - 1000 // FRAME_MS
+            return low + int(np.argmin(self._rms[low:self.max_frames])) + 1
+        return None
+
+    def _take(self, cut):
+        """Remove frames [0, cut) as a window, keeping the overlap for the next one"""
+        has_speech = bool(self._speech[self._fresh_from:cut].any())
+        window = self._audio[:cut * FRAME_SAMPLES] if has_speech else None
+        keep = max(0, cut - self.overlap_frames) if has_speech else cut
+        self._audio = self._audio[keep * FRAME_SAMPLES:]
+        self._speech = self._speech[keep:]
+        self._rms = self._rms[keep:]
+        self._fresh_from = cut - keep
+        self._peeked = self._fresh_from
+        return window
+
+
+def _normalize(word):
+    return word.strip(PUNCTUATION).lower()
+
+
+class TranscriptStitcher:
+    """Joins window transcripts, dropping words repeated from the overlap
+
+    The longest run of words ending the text so far that also starts the
+    new transcript (optionally after one garbled boundary word) is
+    treated as the overlap. Only the last `max_overlap_words` are kept.
+    """
+
+    def __init__(self, max_overlap_words=12):
+        self.max_overlap_words = max_overlap_words
+        self.tail = []
+
+    def add(self, text):
+        """Returns the part of `text` that is new ('' if nothing is)"""
+        new = self._new_words(text)
+        self.tail = (self.tail + new)[-self.max_overlap_words:]
+        return ' '.join(new)
+
+    def preview(self, text):
+        """What add(text) would return, without remembering it (provisional text)"""
+        return ' '.join(self._new_words(text))
+
+    def _new_words(self, text):
+        words = text.split()
+        tail = [_normalize(w) for w in self.tail]
+        normalized = [_normalize(w) for w in words]
+        skip = 0
+        for skip_first, min_match in ((0, 1), (1, 2)):
+            longest = min(len(tail), len(words) - skip_first, self.max_overlap_words)
+            matched = next((k for k in range(longest, min_match - 1, -1)
+                            if tail[-k:] == normalized[skip_first:skip_first + k]), 0)
+            if matched:
+                skip = skip_first + matched
+                break
+        return words[skip:]
+
+
+class ChunkedRecognizer:
+    """Long speech in, progressively stitched text out
+
+    `recognize(samples)` turns one window (int16 array) into text or None;
+    windows are recognized `workers` at a time and stitched in order.
+    `on_text(new_text)` receives each newly recognized piece.
+
+    With `on_partial`, the open window is also recognized every
+    `partial_every_s` of audio (only while a worker is free) and
+    `on_partial(text)` gets its provisional new text. The final text of
+    that window may differ: the caller revises it in place.
+    """
+
+    def __init__(self, recognize, on_text, windower=None, workers=2, on_partial=None,
+                 partial_every_s=1.0):
+        self.windower = windower or ChunkWindower()
+        self.stitcher = TranscriptStitcher()
+        self.recognize = recognize
+        self.on_text = on_text
+        self.on_partial = on_partial
+        self.partial_every_s = partial_every_s
+        self.pieces = []
+        self.pool = RecognizerPool(self._recognize, self._deliver, workers=workers)
+
+    def feed(self, samples):
+        for window in self.windower.feed(samples):
+            self.pool.submit((True, window))
+        if self.on_partial and self.pool.submitted - self.pool.delivered < self.pool.workers:
+            window = self.windower.peek(self.partial_every_s)
+            if window is not None:
+                self.pool.submit((False, window))
+
+    def finish(self, timeout=None):
+        """Recognize what is left and wait for all text; returns the full transcript"""
+        for window in self.windower.flush():
+            self.pool.submit((True, window))
+        self.pool.close(timeout)
+        return ' '.join(self.pieces)
+
+    def _recognize(self, job):
+        final, window = job
+        return final, self.recognize(window)
+
+    def _deliver(self, result):
+        # Delivered in submission order: a window's partials always come before its final
+        final, text = result or (True, None)
+        if not text:
+            return
+        if not final:
+            new = self.stitcher.preview(text)
+            if new:
+                self.on_partial(new)
+            return
+        new = self.stitcher.add(text)
+        if new:
+            self.pieces.append(new)
+            self.on_text(new)
+
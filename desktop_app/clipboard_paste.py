@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Clipboard Paste Transaction
+Paste se pehle user ka clipboard save hota hai aur baad me wapas aa jaata hai.
+Fixed sleep ki jagah clipboard ko poll karke confirm kiya jaata hai ki text set ho gaya.
+"""
+
+import threading
+import time
+
+import pyautogui
+import pyperclip
+
+from latency_trace import tracer
+
+CONFIRM_TIMEOUT = 1.0   # Give up waiting for the clipboard after this long
+RESTORE_DELAY = 0.15    # Time the target app gets to read the clipboard
+
+
+class ClipboardNotReady(RuntimeError):
+    """The clipboard never took the text; nothing was pasted"""
+
+
+def wait_for_clipboard(text, timeout=CONFIRM_TIMEOUT):
+    """Poll until the clipboard holds `text` (1 ms, 2 ms, 4 ms ... 16 ms backoff)"""
+    deadline = time.perf_counter() + timeout
+    delay = 0.001
+    while True:
+        try:
+            if pyperclip.paste() == text:
+                return True
+        except Exception:
+            pass
+        if time.perf_counter() >= deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 0.016)
+
+
+class PasteTransaction:
+    """Snapshot -> set -> confirm -> Ctrl+V -> restore, one paste at a time
+
+    If the clipboard cannot be confirmed, Ctrl+V is not sent (it would paste
+    whatever the user had copied): the snapshot is put back and
+    ClipboardNotReady is raised so the caller can retry or use another backend.
+
+    The restore runs on a timer so the caller does not wait for it. If the
+    next paste starts before that timer fires, the original snapshot is
+    carried over instead of snapshotting our own pasted text.
+    """
+
+    def __init__(self, restore=True, restore_delay=RESTORE_DELAY):
+        self.restore = restore
+        self.restore_delay = restore_delay
+        self._lock = threading.Lock()
+        self._pending = None  # (timer, original clipboard, pasted text)
+        self.last_timings = {}
+
+    def _cancel_pending_restore(self):
+        """Stop a scheduled restore; returns the clipboard it would have restored"""
+        if self._pending is None:
+            return None, False
+        timer, original, _ = self._pending
+        timer.cancel()
+        self._pending = None
+        return original, True
+
+    def _restore(self, original, pasted):
+        with self._lock:
+            if self._pending is None or self._pending[2] is not pasted:
+                return  # A newer paste took over this restore
+            self._pending = None
+            try:
+                # Don't clobber something the user copied in the meantime
+                if pyperclip.paste() == pasted:
+                    pyperclip.copy(original)
+            except Exception as e:
+                print(f"❌ Clipboard restore error: {e}")
+
+    def paste(self, text):
+        """Paste `text` at the cursor; returns timings in milliseconds
+
+        Raises ClipboardNotReady (after restoring the clipboard) when the
+        text never showed up on it.
+        """
+        with self._lock:
+            start = time.perf_counter()
+
+            original, carried = self._cancel_pending_restore()
+            if not carried:
+                try:
+                    original = pyperclip.paste()
+                except Exception:
+                    original = None
+
+            pyperclip.copy(text)
+            confirmed = wait_for_clipboard(text)
+            clipboard_ready = time.perf_counter()
+            tracer.record('clipboard', clipboard_ready - start)
+            if not confirmed:
+                if original is not None:
+                    try:
+                        pyperclip.copy(original)
+                    except Exception as e:
+                        print(f"❌ Clipboard restore error: {e}")
+                raise ClipboardNotReady(f"clipboard not updated within {CONFIRM_TIMEOUT:.1f} s")
+
+            # _pause=False skips pyautogui's default 100 ms PAUSE after the call
+            pyautogui.hotkey('ctrl', 'v', _pause=False)
+            pasted = time.perf_counter()
+
+            if self.restore and original is not None and original != text:
+                timer = threading.Timer(self.restore_delay, self._restore, args=(original, text))
+                timer.daemon = True
+                self._pending = (timer, original, text)
+                timer.start()
+
+            tracer.record('paste', pasted - clipboard_ready)
+            self.last_timings = {
+                'clipboard_ms': (clipboard_ready - start) * 1000,
+                'paste_ms': (pasted - clipboard_ready) * 1000,
+                'total_ms': (pasted - start) * 1000,
+            }
+            return self.last_timings
+
+
+_default_transaction = PasteTransaction()
+
+
+def paste_text(text, restore=True):
+    """Paste with the shared transaction (keeps restores consistent across callers)"""
+    _default_transaction.restore = restore
+    return _default_transaction.paste(text)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Continuous Dictation Pipeline
+Capture -> segmentation (VAD) -> recognition -> output, har stage apne thread me,
+beech me bounded queues. Jab phrase N recognize ho raha hai tab phrase N+1 record
+ho raha hota hai - network ke intezaar me bola hua kuch nahi chhootta.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+from audio_stream import CHUNK
+from recognizer_pool import RecognizerPool
+from vad import UtteranceSegmenter
+
+STOP = object()   # Sentinel passed down the pipeline on shutdown
+
+
+class PipelineStage:
+    """One worker thread: take items from `inbox`, handle them, pass results on
+
+    `inbox` is a bounded queue.Queue, or for the first stage an iterator of
+    items. `handler(item)` returns one result, or None to pass nothing on;
+    with `fan_out=True` it returns a list of results instead.
+    """
+
+    def __init__(self, name, handler, inbox, outbox=None, fan_out=False):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.fan_out = fan_out
+
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.blocked = 0.0       # Time spent waiting for room in the outbox
+        self.max_depth = 0
+        self.started_at = None
+        self._thread = threading.Thread(target=self._run, name=f"Pipeline-{name}", daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _next(self):
+        if isinstance(self.inbox, queue.Queue):
+            self.max_depth = max(self.max_depth, self.inbox.qsize())
+            return self.inbox.get()
+        return next(self.inbox, STOP)
+
+    def _emit(self, item):
+        if self.outbox is None:
+            return
+        waited = time.perf_counter()
+        self.outbox.put(item)
+        self.blocked += time.perf_counter() - waited
+        if item is not STOP:
+            self.emitted += 1
+
+    def _run(self):
+        while True:
+            item = self._next()
+            if item is STOP:
+                break
+            started = time.perf_counter()
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Pipeline {self.name}: {e}")
+                result = None
+            self.busy += time.perf_counter() - started
+            self.processed += 1
+            for out in (result or ()) if self.fan_out else (() if result is None else (result,)):
+                self._emit(out)
+        self._finish()
+        self._emit(STOP)
+
+    def _finish(self):
+        """Hook for stages that hold state until the stream ends"""
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        depth = self.inbox.qsize() if isinstance(self.inbox, queue.Queue) else None
+        return {
+            'stage': self.name,
+            'processed': self.processed,
+            'emitted': self.emitted,
+            'errors': self.errors,
+            'per_second': round(self.processed / elapsed, 2) if elapsed else 0.0,
+            'utilization': round(self.busy / elapsed, 3) if elapsed else 0.0,
+            'blocked_seconds': round(self.blocked, 3),
+            'queue_depth': depth,
+            'max_queue_depth': self.max_depth,
+        }
+
+
+class SegmentStage(PipelineStage):
+    """Audio chunks in, finished utterances (int16 arrays) out"""
+
+    def __init__(self, inbox, outbox, segmenter=None):
+        self.segmenter = segmenter or UtteranceSegmenter()
+        super().__init__('segment', self._feed, inbox, outbox, fan_out=True)
+
+    def _feed(self, data):
+        return self.segmenter.feed(np.frombuffer(data, dtype='<i2'))
+
+    def _finish(self):
+        # Speech still going when capture stopped is the last utterance
+        for utterance in self.segmenter.flush():
+            self._emit(utterance)
+
+
+class RecognizeStage(PipelineStage):
+    """Recognition on a worker pool; texts leave in the order they were spoken"""
+
+    def __init__(self, recognize, inbox, outbox, workers):
+        self.pool = RecognizerPool(recognize, self._deliver, workers=workers)
+        super().__init__('recognize', self._submit, inbox, outbox)
+
+    def _submit(self, audio):
+        self.pool.submit(audio)   # Blocks only while every worker slot is taken
+
+    def _deliver(self, text):
+        if text is not None:
+            self._emit(text)
+
+    def _finish(self):
+        self.pool.close()
+
+    def stats(self):
+        stats = super().stats()
+        stats.update(self.pool.stats())
+        return stats
+
+
+def read_chunks(source, frames=CHUNK):
+    """Yield PCM chunks from an AudioSource until it stops"""
+    while True:
+        data = source.stream.read(frames)
+        if not data:
+            return
+        yield data
+
+
+class DictationPipeline:
+    """capture -> segment -> recognize -> output, joined by bounded queues
+
+    `recognize(samples)` gets one utterance (16 kHz int16 array) and
+    returns text or None; `output(text)` types/stores it. With
+    `workers > 1` several utterances are recognized at once and put back
+    in order before output. A full queue blocks the stage before it, so a
+    slow recognizer backs audio up into the microphone ring buffer instead
+    of growing memory without limit.
+    """
+
+    def __init__(self, source, recognize, output, segmenter=None, workers=1,
+                 chunk_queue=64, utterance_queue=4, text_queue=16):
+        self.source = source
+        self.chunks = queue.Queue(maxsize=chunk_queue)
+        self.utterances = queue.Queue(maxsize=utterance_queue)
+        self.texts = queue.Queue(maxsize=text_queue)
+        if workers > 1:
+            recognize_stage = RecognizeStage(recognize, self.utterances, self.texts, workers)
+        else:
+            recognize_stage = PipelineStage('recognize', recognize, self.utterances, self.texts)
+        self.stages = [
+            PipelineStage('capture', lambda data: data, read_chunks(source), self.chunks),
+            SegmentStage(self.chunks, self.utterances, segmenter),
+            recognize_stage,
+            PipelineStage('output', output, self.texts),
+        ]
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def stop(self):
+        """Stop capturing; utterances already queued are still recognized and typed"""
+        self.source.stop()
+
+    def join(self, timeout=None):
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for stage in self.stages:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not stage.join(remaining):
+                return False
+        return True
+
+    def stats(self):
+        return [stage.stats() for stage in self.stages]
+
+    def format_stats(self):
+        lines = [f"{'stage':<10} {'items':>7} {'/s':>7} {'busy':>6} {'queue':>6} {'max q':>6}"]
+        for s in self.stats():
+            depth = '-' if s['queue_depth'] is None else s['queue_depth']
+            lines.append(f"{s['stage']:<10} {s['processed']:>7} {s['per_second']:>7}"
+                         f" {s['utilization'] * 100:>5.0f}% {depth:>6} {s['max_queue_depth']:>6}")
+        return '\n'.join(lines)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental Typer
+Hypothesis badalne par poora text dobara type nahi hota - sirf farak wala hissa.
+"hello wor" -> "hello world how" = sirf "ld how" type hoga.
+"""
+
+import os
+
+
+def common_prefix_length(a, b):
+    """Length of the shared prefix of two strings"""
+    # os.path.commonprefix compares in C and works on any strings
+    return len(os.path.commonprefix([a, b]))
+
+
+class IncrementalTyper:
+    """Tracks what has been typed for the current utterance and sends only edits
+
+    `write_func(text)` types text at the cursor and `backspace_func(count)`
+    deletes `count` characters before it.
+    """
+
+    def __init__(self, write_func, backspace_func):
+        self.write_func = write_func
+        self.backspace_func = backspace_func
+        self.typed = ''
+        self.keystrokes = 0
+
+    def plan(self, text):
+        """(backspaces, suffix) needed to turn the typed text into `text`"""
+        keep = common_prefix_length(self.typed, text)
+        return len(self.typed) - keep, text[keep:]
+
+    def update(self, text):
+        """Bring the on-screen text in line with a new revision"""
+        backspaces, suffix = self.plan(text)
+        if backspaces:
+            self.backspace_func(backspaces)
+        if suffix:
+            self.write_func(suffix)
+        self.keystrokes += backspaces + len(suffix)
+        self.typed = text
+        return backspaces, suffix
+
+    def commit(self, text=None):
+        """Finish the utterance; the next update starts a fresh one"""
+        if text is not None:
+            self.update(text)
+        self.typed = ''
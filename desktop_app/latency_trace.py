@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latency Tracing
+Bolne se text dikhne tak har stage (hotkey, mic, capture, recognition, clipboard, paste,
+HTTP ack) ka time ek span ke roop me, utterance id ke saath. Har stage ka histogram
+(p50/p90/p99) batata hai ki seconds kahan ja rahe hain.
+
+Usage:
+    python latency_trace.py latency_spans.jsonl      (saved spans ka summary)
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# Upper bounds in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, float('inf'))
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in milliseconds"""
+
+    def __init__(self, buckets=BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        for i, bound in enumerate(self.buckets):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        """Estimate, interpolated inside the bucket that holds the p-th value"""
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(self.buckets, self.counts):
+            if n and seen + n >= rank:
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = bound
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 2) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.50), 2),
+            'p90_ms': round(self.percentile(0.90), 2),
+            'p99_ms': round(self.percentile(0.99), 2),
+            'max_ms': round(self.max, 2),
+        }
+
+
+class LatencyTracer:
+    """Collects timing spans tagged with an utterance id
+
+    The current utterance is per thread: set it once (`set_current` or
+    the `utterance()` context) and every span recorded on that thread is
+    tagged with it. The last `keep` spans are held for inspection; with
+    `log_path` every span is also appended there as a JSON line.
+    """
+
+    def __init__(self, keep=1000, log_path=None):
+        self.histograms = {}
+        self.recent = deque(maxlen=keep)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._log = None
+        if log_path:
+            self.enable_log(log_path)
+
+    def enable_log(self, path):
+        self._log = open(path, 'a', encoding='utf-8', buffering=1)
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex[:8]
+
+    def current(self):
+        return getattr(self._local, 'utterance', None)
+
+    def set_current(self, utterance):
+        self._local.utterance = utterance
+        return utterance
+
+    @contextmanager
+    def utterance(self, utterance):
+        previous = self.current()
+        self.set_current(utterance)
+        try:
+            yield utterance
+        finally:
+            self.set_current(previous)
+
+    @contextmanager
+    def span(self, stage, utterance=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, utterance)
+
+    def record(self, stage, seconds, utterance=None):
+        """Add one finished span of `seconds` for `stage`"""
+        ms = seconds * 1000
+        span = {
+            'utterance': utterance or self.current(),
+            'stage': stage,
+            'ms': round(ms, 3),
+            'ts': time.time(),
+        }
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.observe(ms)
+            self.recent.append(span)
+            if self._log:
+                self._log.write(json.dumps(span) + '\n')
+
+    def spans_for(self, utterance):
+        with self._lock:
+            return [s for s in self.recent if s['utterance'] == utterance]
+
+    def summary(self):
+        with self._lock:
+            return {stage: h.snapshot() for stage, h in self.histograms.items()}
+
+    def format_summary(self):
+        lines = [f"{'stage':<16} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for stage, s in self.summary().items():
+            lines.append(f"{stage:<16} {s['count']:>6} {s['p50_ms']:>9.1f} {s['p90_ms']:>9.1f}"
+                         f" {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+        return '\n'.join(lines)
+
+
+# One tracer per process, shared by every module
+tracer = LatencyTracer()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize saved latency spans")
+    parser.add_argument('path', help="JSONL file written by a tracer with log_path")
+    args = parser.parse_args()
+
+    offline = LatencyTracer()
+    with open(args.path, 'r', encoding='utf-8') as f:
+        for line in f:
+            span = json.loads(line)
+            offline.record(span['stage'], span['ms'] / 1000, span['utterance'])
+    print(offline.format_summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Noise Floor Tracker
+Har recording se pehle 0.5 s calibration ki zarurat nahi - khaali (idle) audio se
+room ka noise level lagataar seekha jaata hai aur config.json me yaad rehta hai.
+"""
+
+import threading
+
+import numpy as np
+
+from audio_stream import CHUNK
+
+FRAME_SAMPLES = 320        # 20 ms at 16 kHz
+DEFAULT_FLOOR = 200.0      # RMS of a fairly quiet room (int16 units)
+MIN_THRESHOLD = 150.0      # Never trigger on near-silence
+THRESHOLD_RATIO = 3.0      # Speech must be this many times louder than the floor
+
+
+def frame_rms(pcm):
+    """RMS of each 20 ms frame of 16-bit mono PCM (vectorized)"""
+    samples = np.frombuffer(pcm, dtype='<i2')
+    usable = len(samples) - len(samples) % FRAME_SAMPLES
+    if usable == 0:
+        return np.empty(0)
+    frames = samples[:usable].astype(np.float32).reshape(-1, FRAME_SAMPLES)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+class NoiseFloorTracker:
+    """Exponential moving estimate of the background noise level
+
+    Frames quieter than the current speech threshold count as noise. The
+    estimate falls quickly (a door closed) and rises slowly (so speech that
+    sneaks in does not drag it up). Frames above the threshold still nudge
+    it up by at most `gated_rise` per frame (~10 %/s), however loud they
+    are: a room that stays louder is learned within seconds, a few words
+    barely move it.
+    """
+
+    def __init__(self, floor=DEFAULT_FLOOR, fall_rate=0.2, rise_rate=0.01, gated_rise=0.002):
+        self.floor = float(floor)
+        self.fall_rate = fall_rate
+        self.rise_rate = rise_rate
+        self.gated_rise = gated_rise
+        self.frames_seen = 0
+        self._lock = threading.Lock()
+
+    @property
+    def threshold(self):
+        """Energy threshold for speech_recognition's Recognizer"""
+        return max(MIN_THRESHOLD, self.floor * THRESHOLD_RATIO)
+
+    def update(self, pcm):
+        """Feed idle audio; returns the new floor"""
+        levels = frame_rms(pcm)
+        with self._lock:
+            for level in levels.tolist():
+                if level >= self.threshold:
+                    # Maybe speech, maybe the room got louder: creep up, never jump
+                    self.floor = min(level, self.floor * (1 + self.gated_rise))
+                else:
+                    rate = self.fall_rate if level < self.floor else self.rise_rate
+                    self.floor += (level - self.floor) * rate
+                self.frames_seen += 1
+            return self.floor
+
+    def apply(self, recognizer):
+        """Copy the current threshold onto a speech_recognition Recognizer"""
+        recognizer.energy_threshold = self.threshold
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(floor=config.get('noise_floor', DEFAULT_FLOOR))
+
+    def save_to(self, config):
+        config['noise_floor'] = round(self.floor, 1)
+
+
+class NoiseFloorMonitor:
+    """Background thread feeding idle microphone audio to a tracker
+
+    `is_idle()` tells whether the user is currently recording; audio is
+    only learned from while idle.
+    """
+
+    def __init__(self, mic_stream, tracker, is_idle):
+        self.mic_stream = mic_stream
+        self.tracker = tracker
+        self.is_idle = is_idle
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="NoiseFloorMonitor", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        with self.mic_stream.capture(preroll=0) as source:
+            while not self._stop.is_set():
+                data = source.stream.read(CHUNK)
+                if not data:
+                    break
+                if self.is_idle():
+                    self.tracker.update(data)
+
+    def stop(self):
+        self._stop.set()
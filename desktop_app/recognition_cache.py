@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Recognition Result Cache
+Bilkul wahi audio dobara aaye (retry, test run) to recognizer ko phir se nahi bhejte.
+Key = PCM bytes ka hash + language + engine. Memory me LRU, disk par SQLite; purani
+entries TTL se aur zyada ho jaane par size limit se hat jaati hain.
+
+Usage:
+    python recognition_cache.py stats
+    python recognition_cache.py clear
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from recognition_engines import RecognitionEngine, pcm16
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+CACHE_FILE = 'recognition_cache.db'
+
+
+def fingerprint(audio, language, engine_name):
+    """Cache key for one utterance in one language on one engine"""
+    digest = hashlib.blake2b(pcm16(audio), digest_size=16).hexdigest()
+    return f"{engine_name}:{language}:{digest}"
+
+
+class RecognitionCache:
+    """Two-level cache of (text, confidence) by audio fingerprint
+
+    Memory holds the `max_entries` most recently used results; disk holds
+    up to `max_disk_entries`, least recently used dropped first. Entries
+    older than `ttl` seconds are never returned. `directory=None` keeps
+    the cache in memory only.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_entries=256, max_disk_entries=10000,
+                 ttl=7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(directory, CACHE_FILE),
+                                       timeout=10, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, text TEXT NOT NULL, confidence REAL,"
+                " created REAL NOT NULL, used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+            self._db.commit()
+
+    def get(self, key):
+        """(text, confidence) or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[2] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0], entry[1]
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text, confidence, created FROM results WHERE key = ? AND created >= ?",
+                    (key, now - self.ttl),
+                ).fetchone()
+                if row:
+                    self._db.execute("UPDATE results SET used = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row)
+                    self.disk_hits += 1
+                    return row[0], row[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, text, confidence=None):
+        now = time.time()
+        with self._lock:
+            self._remember(key, (text, confidence, now))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, text, confidence, created, used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, text, confidence, now, now),
+                )
+                self._trim_disk(now)
+                self._db.commit()
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _trim_disk(self, now):
+        cur = self._db.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        self.evictions += cur.rowcount
+        cur = self._db.execute(
+            "DELETE FROM results WHERE key IN ("
+            " SELECT key FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+        self.evictions += cur.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            disk = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] if self._db else 0
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+                'disk_entries': disk,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedEngine(RecognitionEngine):
+    """Wraps an engine so identical audio is only recognized once"""
+
+    def __init__(self, engine, cache):
+        self.engine = engine
+        self.cache = cache
+        self.name = engine.name
+        self.upload_sample_rate = engine.upload_sample_rate
+
+    def available(self):
+        return self.engine.available()
+
+    def load(self):
+        self.engine.load()
+        return self
+
+    def recognize(self, audio, language):
+        key = fingerprint(audio, language, self.name)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0]
+        text = self.engine.recognize(audio, language)
+        self.cache.put(key, text)
+        return text
+
+    def recognize_with_confidence(self, audio, language):
+        key = fingerprint(audio, language, self.name)
+        cached = self.cache.get(key)
+        if cached is not None and cached[1] is not None:
+            return cached
+        text, confidence = self.engine.recognize_with_confidence(audio, language)
+        self.cache.put(key, text, confidence)
+        return text, confidence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recognition result cache")
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument('--dir', default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    cache = RecognitionCache(args.dir)
+    if args.command == 'clear':
+        cache.clear()
+        print("🗑️  Recognition cache cleared")
+    else:
+        stats = cache.stats()
+        print(f"{stats['disk_entries']} cached result(s) in {os.path.join(args.dir, CACHE_FILE)}")
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speech Recognition Engines
+Audio -> text ke alag-alag engine, config.json ki 'recognition_engine' se chuna jaata hai.
+Engine (aur offline model) startup par ek hi baar load hota hai aur har phrase par reuse.
+
+    google   - Google Web Speech (internet chahiye, har phrase ek network round trip)
+    vosk     - Offline Kaldi model (pip install vosk + model folder)
+    whisper  - Offline whisper.cpp (pip install pywhispercpp + ggml model)
+    stub     - Deterministic nakli engine, tests aur benchmarks ke liye
+
+Sab engines speech_recognition ke exceptions hi raise karte hain (UnknownValueError,
+RequestError), isliye apps ka error handling same rehta hai.
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+
+import numpy as np
+import speech_recognition as sr
+
+from audio_encoder import upload_form
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+try:
+    from pywhispercpp.model import Model as WhisperModel
+except ImportError:
+    WhisperModel = None
+
+SAMPLE_RATE = 16000
+
+
+def pcm16(audio):
+    """16 kHz 16-bit mono bytes from an AudioData"""
+    return audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+
+
+class RecognitionEngine:
+    """Base class: turns one utterance (sr.AudioData) into text"""
+
+    name = 'base'
+    upload_sample_rate = None   # Online engines: lowest sample rate the service accepts
+
+    def available(self):
+        """Are this engine's libraries/models present?"""
+        return False
+
+    def load(self):
+        """Load models once, before the first phrase"""
+        return self
+
+    def set_operation_timeout(self, seconds):
+        """Make a hung network call give up after `seconds` (online engines)"""
+
+    def recognize(self, audio, language):
+        """Text for `audio`; raises sr.UnknownValueError / sr.RequestError"""
+        raise NotImplementedError
+
+    def recognize_with_confidence(self, audio, language):
+        """(text, confidence 0..1) - confidence is None if the engine has none"""
+        return self.recognize(audio, language), None
+
+
+class GoogleEngine(RecognitionEngine):
+    """speech_recognition's recognize_google (online)"""
+
+    name = 'google'
+    upload_sample_rate = 8000
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def available(self):
+        return True
+
+    def set_operation_timeout(self, seconds):
+        # Default None: a stalled socket would block its thread forever
+        self.recognizer.operation_timeout = seconds
+
+    def recognize(self, audio, language):
+        # Audio encoded during capture goes up as-is (see audio_encoder)
+        return self.recognizer.recognize_google(upload_form(audio), language=language)
+
+    def recognize_with_confidence(self, audio, language):
+        result = self.recognizer.recognize_google(upload_form(audio), language=language, show_all=True)
+        if not isinstance(result, dict) or not result.get('alternative'):
+            raise sr.UnknownValueError()
+        # Only the top alternative carries a confidence
+        best = result['alternative'][0]
+        return best['transcript'], best.get('confidence')
+
+
+class VoskEngine(RecognitionEngine):
+    """Offline Vosk/Kaldi; one resident model per language
+
+    `models` maps a language code ('en-US', 'hi-IN') to a model folder
+    from https://alphacephei.com/vosk/models.
+    """
+
+    name = 'vosk'
+
+    def __init__(self, models=None):
+        self.model_paths = models or {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def available(self):
+        return vosk is not None and bool(self.model_paths)
+
+    def load(self):
+        vosk.SetLogLevel(-1)
+        for language in self.model_paths:
+            self._model(language)
+        return self
+
+    def _model(self, language):
+        with self._lock:
+            if language not in self._models:
+                path = self.model_paths.get(language)
+                if not path:
+                    raise sr.RequestError(f"No Vosk model configured for {language}")
+                self._models[language] = vosk.Model(path)
+            return self._models[language]
+
+    def recognize(self, audio, language):
+        return self.recognize_with_confidence(audio, language)[0]
+
+    def recognize_with_confidence(self, audio, language):
+        # Models are shared; a KaldiRecognizer per phrase is cheap
+        recognizer = vosk.KaldiRecognizer(self._model(language), SAMPLE_RATE)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(pcm16(audio))
+        result = json.loads(recognizer.FinalResult())
+        text = result.get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+        words = result.get('result') or []
+        confidence = sum(w.get('conf', 0.0) for w in words) / len(words) if words else None
+        return text, confidence
+
+
+class WhisperEngine(RecognitionEngine):
+    """Offline whisper.cpp through pywhispercpp; one multilingual model"""
+
+    name = 'whisper'
+
+    def __init__(self, model='base', threads=4):
+        self.model_name = model
+        self.threads = threads
+        self._model = None
+        self._lock = threading.Lock()   # A whisper.cpp context is not thread-safe
+
+    def available(self):
+        return WhisperModel is not None
+
+    def load(self):
+        if self._model is None:
+            self._model = WhisperModel(self.model_name, n_threads=self.threads,
+                                       print_progress=False, print_realtime=False)
+        return self
+
+    def recognize(self, audio, language):
+        samples = np.frombuffer(pcm16(audio), dtype='<i2').astype(np.float32) / 32768.0
+        with self._lock:
+            segments = self.load()._model.transcribe(samples, language=language.split('-')[0])
+        text = ' '.join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class StubEngine(RecognitionEngine):
+    """Deterministic fake: same audio always gives the same text
+
+    Returns `text` if given, otherwise a label built from the audio length
+    and a checksum. `latency` simulates a slow engine; `confidence` maps a
+    language to the confidence reported for it (default 1.0).
+
+    Fault injection for resilience checks: `failure_rate` of calls raise
+    RequestError, `tail_rate` of calls take `tail_latency` instead, and
+    setting `down = True` fails every call (service outage). `seed` makes
+    the faults repeatable.
+    """
+
+    name = 'stub'
+
+    def __init__(self, text=None, latency=0.0, confidence=None, failure_rate=0.0,
+                 tail_rate=0.0, tail_latency=0.0, seed=None):
+        self.text = text
+        self.latency = latency
+        self.confidence = confidence or {}
+        self.failure_rate = failure_rate
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.down = False
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def available(self):
+        return True
+
+    def _fault(self):
+        """(latency, fail?) for this call"""
+        with self._lock:
+            self.calls += 1
+            slow = self._random.random() < self.tail_rate
+            fail = self.down or self._random.random() < self.failure_rate
+        return (self.tail_latency if slow else self.latency), fail
+
+    def recognize(self, audio, language):
+        data = pcm16(audio)
+        latency, fail = self._fault()
+        if latency:
+            time.sleep(latency)
+        if fail:
+            raise sr.RequestError("stub recognizer: injected failure")
+        if not data:
+            raise sr.UnknownValueError()
+        if self.text is not None:
+            return self.text
+        seconds = len(data) / 2 / SAMPLE_RATE
+        return f"utterance {seconds:.2f}s {zlib.crc32(data):08x}"
+
+    def recognize_with_confidence(self, audio, language):
+        return self.recognize(audio, language), self.confidence.get(language, 1.0)
+
+
+ENGINES = {
+    'google': GoogleEngine,
+    'vosk': VoskEngine,
+    'whisper': WhisperEngine,
+    'stub': StubEngine,
+}
+
+
+def create_engine(name, **options):
+    """Engine by name with its options (not loaded yet); None if unknown"""
+    factory = ENGINES.get(name)
+    return factory(**options) if factory else None
+
+
+def load_engine(config):
+    """The engine chosen in config, loaded and ready; falls back to Google
+
+    config keys: 'recognition_engine' plus that engine's options under
+    'recognition_options', e.g. {"models": {"en-US": "models/vosk-en"}}.
+    Calls get deadlines, retries and hedging ('recognition_deadline_s',
+    'hedge_engine'); with 'recognition_cache' (default on) repeated audio
+    is answered from the result cache.
+    """
+    name = config.get('recognition_engine', 'google')
+    try:
+        engine = create_engine(name, **config.get('recognition_options', {}))
+        if engine is None:
+            raise ValueError(f"unknown engine '{name}'")
+        if not engine.available():
+            raise RuntimeError(f"'{name}' is not installed or has no model configured")
+        engine.load()
+        print(f"🧠 Recognition engine: {engine.name}")
+    except Exception as e:
+        print(f"⚠️  Recognition engine {name}: {e} - using Google")
+        engine = GoogleEngine()
+
+    from resilient_recognition import ResilientEngine
+    hedge = None
+    hedge_name = config.get('hedge_engine')
+    if hedge_name:
+        try:
+            hedge = create_engine(hedge_name, **config.get('hedge_options', {}))
+            if hedge is None or not hedge.available():
+                raise RuntimeError("not available")
+            hedge.load()
+        except Exception as e:
+            print(f"⚠️  Hedge engine {hedge_name}: {e} - no hedging")
+            hedge = None
+    deadline = config.get('recognition_deadline_s', 8.0)
+    engine = ResilientEngine(engine, hedge, deadline=deadline, attempt_timeout=deadline / 2)
+
+    if config.get('recognition_cache', True):
+        from recognition_cache import CachedEngine, RecognitionCache
+        engine = CachedEngine(engine, RecognitionCache())
+    return engine
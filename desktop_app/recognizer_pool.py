@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel Recognizer Pool
+Kai utterances ek saath recognize hote hain (thread ya process pool), lekin result
+hamesha usi order me nikalte hain jisme bole gaye the - typed text kabhi ulta-pulta nahi.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class OrderedResults:
+    """Holds out-of-order results until every earlier sequence number is in"""
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+        self.next_seq = 0
+        self.max_waiting = 0
+        self._ready = {}
+        self._lock = threading.Lock()
+
+    def put(self, seq, value):
+        # Delivering under the lock keeps two finishing workers from racing
+        with self._lock:
+            self._ready[seq] = value
+            self.max_waiting = max(self.max_waiting, len(self._ready) - 1)
+            while self.next_seq in self._ready:
+                self.deliver(self._ready.pop(self.next_seq))
+                self.next_seq += 1
+
+    def waiting(self):
+        return len(self._ready)
+
+
+class RecognizerPool:
+    """Runs `recognize(audio)` on several workers, delivers results in order
+
+    `deliver(result)` is called once per submitted utterance, strictly in
+    submission order (None results included). At most `max_in_flight`
+    utterances are pending; submit() blocks beyond that. With
+    `processes=True`, `recognize` and its argument must be picklable.
+    """
+
+    def __init__(self, recognize, deliver, workers=4, processes=False, max_in_flight=None):
+        self.recognize = recognize
+        self.workers = workers
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        self.executor = executor(max_workers=workers)
+        self.ordered = OrderedResults(self._deliver)
+        self.deliver = deliver
+        self._slots = threading.BoundedSemaphore(max_in_flight or workers * 2)
+        self._cond = threading.Condition()
+        self.submitted = 0
+        self.delivered = 0
+        self.errors = 0
+
+    def submit(self, audio):
+        """Queue one utterance; returns its sequence number"""
+        self._slots.acquire()
+        with self._cond:
+            seq = self.submitted
+            self.submitted += 1
+        future = self.executor.submit(self.recognize, audio)
+        future.add_done_callback(lambda f, seq=seq: self._done(seq, f))
+        return seq
+
+    def _done(self, seq, future):
+        try:
+            value = future.result()
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ Recognition failed: {e}")
+            value = None
+        self._slots.release()
+        self.ordered.put(seq, value)
+
+    def _deliver(self, value):
+        try:
+            self.deliver(value)
+        finally:
+            with self._cond:
+                self.delivered += 1
+                self._cond.notify_all()
+
+    def drain(self, timeout=None):
+        """Wait until every submitted utterance has been delivered"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.delivered >= self.submitted, timeout)
+
+    def close(self, timeout=None):
+        self.drain(timeout)
+        self.executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'in_flight': self.submitted - self.delivered,
+            'reorder_waiting': self.ordered.waiting(),
+            'max_reorder_waiting': self.ordered.max_waiting,
+            'recognition_errors': self.errors,
+        }
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resilient Recognition
+Recognizer atak jaaye ya fail ho to audio phenkte nahi: har call ki deadline, jitter ke
+saath retry, der lage to doosre backend ko bhi wahi request (hedge). Phir bhi na ho to
+audio disk spool me jaata hai aur service wapas aate hi background me recognize hokar
+transcript log me jud jaata hai.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import speech_recognition as sr
+
+from recognition_engines import RecognitionEngine
+
+DEFAULT_SPOOL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spool')
+DEFAULT_HEDGE_AFTER = 1.5   # Seconds, until enough latencies are known
+
+
+class RecognizerStuck(sr.RequestError):
+    """Every recognition thread is still waiting on an abandoned call"""
+
+
+class ResilientEngine(RecognitionEngine):
+    """Deadlines, jittered retries and hedged requests around an engine
+
+    Each attempt may take `attempt_timeout`; the whole call `deadline`.
+    With a second backend in `hedge`, a request the primary has not
+    answered by the recent 95th-percentile latency (or `hedge_after`) is
+    also sent there and the first answer wins; without one nothing is
+    hedged. Failed attempts are retried after a random delay of up to
+    backoff * 2**attempt. UnknownValueError (no speech) is never retried.
+
+    A timed-out call cannot be cancelled, only abandoned: engines get
+    `attempt_timeout` as their network timeout so abandoned calls end,
+    and once abandoned calls would leave no thread for a new attempt,
+    calls fail fast with RecognizerStuck (a RequestError, so the audio is
+    spooled) instead of queueing behind them.
+    """
+
+    def __init__(self, engine, hedge=None, deadline=8.0, attempt_timeout=4.0, retries=2,
+                 backoff=0.25, max_backoff=2.0, hedge_after=None, max_workers=16):
+        self.engine = engine
+        self.hedge = hedge if hedge is not engine else None
+        self.name = engine.name
+        self.upload_sample_rate = engine.upload_sample_rate
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_after = hedge_after
+        # Abandoned (timed out or outraced) calls keep a thread until they return
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Recognition")
+        self.abandoned = 0
+        self._abandoned_lock = threading.Lock()
+        for backend in (engine, self.hedge):
+            if backend is not None:
+                backend.set_operation_timeout(attempt_timeout)
+        self._latencies = deque(maxlen=200)
+        self.counters = {'calls': 0, 'retries': 0, 'timeouts': 0, 'hedges': 0,
+                         'hedge_wins': 0, 'stuck': 0, 'failures': 0}
+
+    def available(self):
+        return self.engine.available()
+
+    def load(self):
+        self.engine.load()
+        if self.hedge is not None:
+            self.hedge.load()
+        return self
+
+    def set_operation_timeout(self, seconds):
+        self.engine.set_operation_timeout(seconds)
+        if self.hedge is not None:
+            self.hedge.set_operation_timeout(seconds)
+
+    def recognize(self, audio, language):
+        return self._run('recognize', audio, language)
+
+    def recognize_with_confidence(self, audio, language):
+        return self._run('recognize_with_confidence', audio, language)
+
+    def hedge_delay(self):
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if len(self._latencies) < 20:
+            return DEFAULT_HEDGE_AFTER
+        ordered = sorted(self._latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def _run(self, method, audio, language):
+        self.counters['calls'] += 1
+        deadline = time.perf_counter() + self.deadline
+        error = None
+        for attempt in range(self.retries + 1):
+            try:
+                return self._attempt(method, audio, language, deadline)
+            except sr.UnknownValueError:
+                raise
+            except RecognizerStuck:
+                self.counters['stuck'] += 1
+                self.counters['failures'] += 1
+                raise
+            except Exception as e:
+                error = e
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            if attempt == self.retries or time.perf_counter() + delay >= deadline:
+                break
+            self.counters['retries'] += 1
+            time.sleep(delay)
+        self.counters['failures'] += 1
+        raise sr.RequestError(f"recognition failed after {attempt + 1} attempt(s): {error}")
+
+    def _abandon(self, futures):
+        """Count calls nobody waits for any more until their threads are free"""
+        for future in futures:
+            with self._abandoned_lock:
+                self.abandoned += 1
+            future.add_done_callback(self._released)
+
+    def _released(self, future):
+        with self._abandoned_lock:
+            self.abandoned -= 1
+
+    def _attempt(self, method, audio, language, deadline):
+        """One attempt: the primary, plus a hedged request if it is slow"""
+        # Room for a primary and a hedge, or this call would only queue behind hung ones
+        if self.abandoned >= self.max_workers - 2:
+            raise RecognizerStuck(f"{self.abandoned} earlier recognition calls still hanging")
+        start = time.perf_counter()
+        attempt_deadline = min(start + self.attempt_timeout, deadline)
+        hedge_at = start + self.hedge_delay() if self.hedge is not None else float('inf')
+        futures = {self.executor.submit(getattr(self.engine, method), audio, language): 'primary'}
+        try:
+            return self._wait(futures, method, audio, language, start, attempt_deadline, hedge_at)
+        finally:
+            self._abandon(futures)   # Whatever is left: timed out, or lost the race
+
+    def _wait(self, futures, method, audio, language, start, attempt_deadline, hedge_at):
+        hedged = False
+        error = None
+        while futures:
+            now = time.perf_counter()
+            if now >= attempt_deadline:
+                self.counters['timeouts'] += 1
+                raise TimeoutError(f"no answer in {now - start:.1f} s")
+            wake = attempt_deadline if hedged else min(hedge_at, attempt_deadline)
+            done, _ = wait(futures, timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+            if not done:
+                if not hedged and time.perf_counter() >= hedge_at:
+                    hedged = True
+                    self.counters['hedges'] += 1
+                    futures[self.executor.submit(getattr(self.hedge, method), audio, language)] = 'hedge'
+                continue
+            for future in done:
+                kind = futures.pop(future)
+                try:
+                    result = future.result()
+                except sr.UnknownValueError:
+                    raise
+                except Exception as e:
+                    error = e
+                    continue
+                if kind == 'primary':
+                    self._latencies.append(time.perf_counter() - start)
+                else:
+                    self.counters['hedge_wins'] += 1
+                return result
+        raise error
+
+    def stats(self):
+        return dict(self.counters, abandoned=self.abandoned, hedge_after=round(self.hedge_delay(), 3))
+
+
+class RecognitionSpool:
+    """Audio that could not be recognized, kept on disk until the service is back
+
+    Each item is a raw PCM file plus a JSON file (written last, so a
+    half-written item is never picked up). A background thread retries
+    the oldest items every `retry_interval` seconds, backing off up to
+    `max_interval` while the service stays down. `recognize(audio,
+    language)` returns text; `on_recovered(text, language, timestamp)` gets
+    each success.
+    """
+
+    def __init__(self, recognize, on_recovered, directory=DEFAULT_SPOOL_DIR,
+                 retry_interval=15.0, max_interval=300.0, max_items=500):
+        self.recognize = recognize
+        self.on_recovered = on_recovered
+        self.directory = directory
+        self.retry_interval = retry_interval
+        self.max_interval = max_interval
+        self.max_items = max_items
+        self.recovered = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="RecognitionSpool", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def add(self, audio, language, timestamp=None):
+        """Spool one utterance (sr.AudioData) for later recognition"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        name = f"{int(timestamp * 1000):015d}-{uuid.uuid4().hex[:8]}"
+        base = os.path.join(self.directory, name)
+        with open(base + '.pcm', 'wb') as f:
+            f.write(audio.get_raw_data())
+        meta = {'language': language, 'ts': timestamp,
+                'sample_rate': audio.sample_rate, 'sample_width': audio.sample_width}
+        with open(base + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(base + '.tmp', base + '.json')
+        self._trim()
+
+    def pending(self):
+        return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith('.json'))
+
+    def _remove(self, name):
+        for ext in ('.json', '.pcm'):
+            try:
+                os.remove(os.path.join(self.directory, name + ext))
+            except FileNotFoundError:
+                pass
+
+    def _trim(self):
+        items = self.pending()
+        for name in items[:max(0, len(items) - self.max_items)]:
+            self._remove(name)
+            self.dropped += 1
+
+    def drain(self):
+        """Try every spooled item, oldest first; False if the service is still down"""
+        for name in self.pending():
+            base = os.path.join(self.directory, name)
+            try:
+                with open(base + '.json', 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(base + '.pcm', 'rb') as f:
+                    audio = sr.AudioData(f.read(), meta['sample_rate'], meta['sample_width'])
+            except (OSError, ValueError, KeyError):
+                self._remove(name)   # Damaged item
+                continue
+            try:
+                text = self.recognize(audio, meta['language'])
+            except sr.UnknownValueError:
+                self._remove(name)   # Nothing to recover in it
+                continue
+            except Exception as e:
+                print(f"📦 Spool: recognizer still unavailable ({e})")
+                return False
+            self.on_recovered(text, meta['language'], meta['ts'])
+            self.recovered += 1
+            self._remove(name)
+        return True
+
+    def _run(self):
+        interval = self.retry_interval
+        while not self._stop.wait(interval):
+            if not self.pending():
+                interval = self.retry_interval
+                continue
+            interval = self.retry_interval if self.drain() else min(interval * 2, self.max_interval)
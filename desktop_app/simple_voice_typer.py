@@ -20,8 +20,11 @@ import time
 import tkinter as tk
 from tkinter import ttk
 import speech_recognition as sr
-import pyautogui
-import pyperclip
+
+from text_injection import inject_text
+from audio_stream import ContinuousMicrophone
+from noise_floor import NoiseFloorTracker, NoiseFloorMonitor
+from recognition_engines import load_engine
 
 # Configuration
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
@@ -29,17 +32,26 @@ CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
 class SimpleVoiceTyper:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
         self.is_recording = False
+        self.capture = None
         
         # Load config
         self.load_config()
         
+        # Recognition engine from config, loaded once
+        self.engine = load_engine(self.config)
+        
         # Adjust recognizer
-        self.recognizer.energy_threshold = 4000
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
         
+        # Always-open mic; noise level is learned in the background while idle
+        self.mic_stream = ContinuousMicrophone().start()
+        self.noise_floor = NoiseFloorTracker.from_config(self.config)
+        self.noise_monitor = NoiseFloorMonitor(
+            self.mic_stream, self.noise_floor, lambda: not self.is_recording
+        ).start()
+        
         # Create GUI
         self.create_gui()
         
@@ -165,6 +177,8 @@ class SimpleVoiceTyper:
             return
         
         self.is_recording = True
+        self.capture = self.mic_stream.capture(preroll=self.config.get('preroll_seconds', 0.3))
+        self.noise_floor.apply(self.recognizer)
         self.record_btn.config(
             text="⏹️ STOP RECORDING",
             bg='#e74c3c',
@@ -183,6 +197,8 @@ class SimpleVoiceTyper:
             return
         
         self.is_recording = False
+        if self.capture:
+            self.capture.stop()  # Recognize what was said so far
         self.record_btn.config(
             text="🎤 START RECORDING",
             bg='#27ae60',
@@ -193,11 +209,7 @@ class SimpleVoiceTyper:
     def record_and_type(self):
         """Record audio and convert to text"""
         try:
-            with self.microphone as source:
-                self.update_status("🔊 Adjusting for noise...", '#f39c12')
-                print("🔊 Adjusting for ambient noise...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
+            with self.capture as source:
                 self.update_status("✅ Listening...", '#2ecc71')
                 print("✅ Listening...")
                 
@@ -217,10 +229,7 @@ class SimpleVoiceTyper:
             
             # Recognize speech
             try:
-                text = self.recognizer.recognize_google(
-                    audio,
-                    language=self.config['language']
-                )
+                text = self.engine.recognize(audio, self.config['language'])
                 
                 print(f"✅ Recognized: {text}")
                 self.update_status(f"✅ Recognized: {text[:30]}...", '#2ecc71')
@@ -257,17 +266,9 @@ class SimpleVoiceTyper:
         try:
             time.sleep(0.3)
             
-            # For Hindi or Unicode, use clipboard
-            if self.config['language'] == 'hi-IN' or any(ord(c) > 127 for c in text):
-                pyperclip.copy(text)
-                print("📋 Copied to clipboard...")
-                time.sleep(0.1)
-                pyautogui.hotkey('ctrl', 'v')
-                print("⌨️ Pasted!")
-            else:
-                # For English, direct typing
-                pyautogui.write(text, interval=0.01)
-                print("⌨️ Typed!")
+            # Fastest backend that can type this text (SendInput / xdotool / clipboard)
+            backend = inject_text(text, self.config.get('typing_backend', 'auto'))
+            print(f"⌨️ Typed! ({backend})")
             
             print(f"{'='*50}\n")
             
@@ -292,6 +293,12 @@ class SimpleVoiceTyper:
         print("="*60 + "\n")
         
         self.root.mainloop()
+        
+        # Window closed: remember the room's noise level for next time
+        self.noise_monitor.stop()
+        self.noise_floor.save_to(self.config)
+        self.save_config()
+        self.mic_stream.stop()
 
 def main():
     try:
@@ -13,8 +13,24 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+import json
+import os
+
 import speech_recognition as sr
 
+from noise_floor import NoiseFloorTracker
+from recognition_engines import load_engine
+
+CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
+
+
+def load_config():
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 def test_microphones():
     """Test all available microphones"""
     print("\n" + "="*60)
@@ -41,11 +57,19 @@ def test_microphones():
     print("="*60 + "\n")
     
     recognizer = sr.Recognizer()
+    config = load_config()
+    engine = load_engine(config)
     
     try:
         with sr.Microphone() as source:
-            print("🔊 Adjusting for ambient noise... Please wait.")
-            recognizer.adjust_for_ambient_noise(source, duration=1)
+            if 'noise_floor' in config:
+                # Voice Typer already learned this room's noise level
+                tracker = NoiseFloorTracker.from_config(config)
+                tracker.apply(recognizer)
+                print(f"🔊 Using saved noise level (threshold {recognizer.energy_threshold:.0f})")
+            else:
+                print("🔊 Adjusting for ambient noise... Please wait.")
+                recognizer.adjust_for_ambient_noise(source, duration=1)
             
             print("\n✅ Microphone is working!")
             print("🎤 Speak something for 3 seconds to test...")
@@ -61,7 +85,7 @@ def test_microphones():
             
             # Try to recognize
             try:
-                text = recognizer.recognize_google(audio, language='en-US')
+                text = engine.recognize(audio, 'en-US')
                 print(f"\n✅ SUCCESS! Recognized: '{text}'")
                 print("\n🎉 Your microphone is working perfectly!")
                 
@@ -70,7 +94,7 @@ def test_microphones():
                 print("   But microphone is working! Just speak more clearly.")
                 
             except sr.RequestError as e:
-                print(f"\n❌ Error with Google Speech API: {e}")
+                print(f"\n❌ Error with {engine.name} recognition: {e}")
                 print("   Check your internet connection!")
                 
     except Exception as e:
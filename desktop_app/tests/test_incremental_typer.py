@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IncrementalTyper tests: revision par sirf zaroori backspaces aur naya suffix, aur chunked
+mode me chalu window ka provisional text jagah par hi sudharta hai.
+
+Run:  python -m pytest desktop_app/tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from incremental_typer import IncrementalTyper
+from chunked_recognition import ChunkedRecognizer
+from benchmark_vad import synthetic_fixture
+
+
+class Screen:
+    """Fake focused window: what the typer's keystrokes leave on screen"""
+
+    def __init__(self):
+        self.text = ''
+        self.calls = []
+
+    def write(self, text):
+        self.calls.append(('write', text))
+        self.text += text
+
+    def backspace(self, count):
+        self.calls.append(('backspace', count))
+        self.text = self.text[:-count]
+
+
+class IncrementalTyperTest(unittest.TestCase):
+    def setUp(self):
+        self.screen = Screen()
+        self.typer = IncrementalTyper(self.screen.write, self.screen.backspace)
+
+    def test_growing_hypothesis_types_only_the_suffix(self):
+        self.assertEqual(self.typer.update("hello wor"), (0, "hello wor"))
+        self.assertEqual(self.typer.update("hello world how"), (0, "ld how"))
+        self.assertEqual(self.screen.text, "hello world how")
+        self.assertEqual(self.typer.keystrokes, len("hello world how"))
+
+    def test_revision_backspaces_to_common_prefix(self):
+        self.typer.update("I scream")
+        self.assertEqual(self.typer.update("ice cream"), (8, "ice cream"))
+        self.typer.update("ice cream cone")
+        self.assertEqual(self.typer.update("ice creamy"), (5, "y"))
+        self.assertEqual(self.screen.text, "ice creamy")
+        self.assertEqual(self.screen.calls[-2:], [('backspace', 5), ('write', 'y')])
+
+    def test_shorter_revision_only_deletes(self):
+        self.typer.update("hello world")
+        self.assertEqual(self.typer.update("hello"), (6, ''))
+        self.assertEqual(self.screen.text, "hello")
+        self.assertEqual(self.screen.calls[-1], ('backspace', 6))
+
+    def test_same_text_sends_nothing(self):
+        self.typer.update("hello")
+        calls = len(self.screen.calls)
+        self.assertEqual(self.typer.update("hello"), (0, ''))
+        self.assertEqual(len(self.screen.calls), calls)
+
+    def test_unicode_is_counted_in_characters(self):
+        self.typer.update("नमस्ते दुनिया")
+        self.assertEqual(self.typer.update("नमस्ते दोस्त"), (5, "ोस्त"))
+        self.assertEqual(self.screen.text, "नमस्ते दोस्त")
+
+    def test_commit_starts_a_fresh_utterance(self):
+        self.typer.commit("first phrase")
+        self.assertEqual(self.typer.update("second"), (0, "second"))
+        self.assertEqual(self.screen.text, "first phrasesecond")
+
+
+class ChunkedRevisionTest(unittest.TestCase):
+    """Provisional window text is revised in place, as record_chunked does it"""
+
+    def test_screen_ends_with_the_stitched_transcript(self):
+        screen = Screen()
+        typer = IncrementalTyper(screen.write, screen.backspace)
+        committed = []
+        partials = []
+
+        def recognize(window):
+            # One word per half second: a longer view of a window revises its text
+            return ' '.join(f"w{i}" for i in range(len(window) // 8000))
+
+        def on_text(piece):
+            committed.append(piece)
+            typer.update(' '.join(committed))
+
+        def on_partial(piece):
+            partials.append(piece)
+            typer.update(' '.join(committed + [piece]))
+
+        samples, _ = synthetic_fixture(20, seed=3)
+        chunked = ChunkedRecognizer(recognize, on_text, on_partial=on_partial, partial_every_s=0.5)
+        for i in range(0, len(samples), 1024):
+            chunked.feed(samples[i:i + 1024])
+        text = chunked.finish()
+        typer.commit(text)
+
+        self.assertTrue(partials)
+        self.assertEqual(screen.text, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
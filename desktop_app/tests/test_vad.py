@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VAD + Endpointer regression tests: benchmark_vad ka labelled synthetic audio, aur frame
+accuracy / end boundary error tay seema ke andar rehne chahiye.
+
+Run:  python -m pytest desktop_app/tests
+"""
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from benchmark_vad import accuracy, synthetic_fixture
+from vad import Endpointer, SAMPLE_RATE, segment
+
+SEEDS = (7, 1, 2, 3)
+
+# Measured: frame accuracy 87-89 %, end error median 27-36 ms / max 64-79 ms
+MIN_FRAME_ACCURACY = 0.85
+MAX_MISSED_SPEECH = 0.25
+MAX_MEDIAN_END_ERROR_S = 0.060
+MAX_END_ERROR_S = 0.150
+MAX_DETECTED_PER_LABEL = 1.5   # Noise bursts may add a few segments, not many
+
+
+class EndpointerAccuracyTest(unittest.TestCase):
+    def test_labelled_fixture_stays_within_thresholds(self):
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                samples, labels = synthetic_fixture(60, seed=seed)
+                frame_acc, missed, found, matched, end_errors = accuracy(samples, labels)
+                self.assertGreaterEqual(frame_acc, MIN_FRAME_ACCURACY)
+                self.assertLessEqual(missed, MAX_MISSED_SPEECH)
+                self.assertEqual(matched, len(labels))
+                self.assertLessEqual(found, len(labels) * MAX_DETECTED_PER_LABEL)
+                self.assertLessEqual(float(np.median(end_errors)), MAX_MEDIAN_END_ERROR_S)
+                self.assertLessEqual(max(end_errors), MAX_END_ERROR_S)
+
+    def test_streaming_blocks_match_offline_segments(self):
+        samples, _ = synthetic_fixture(30, seed=7)
+        endpointer = Endpointer()
+        events = []
+        for i in range(0, len(samples), 1024):
+            events.extend(endpointer.process(samples[i:i + 1024]))
+        events.extend(endpointer.flush())
+        starts = [p for kind, p in events if kind == 'start']
+        ends = [min(p, len(samples)) for kind, p in events if kind == 'end']
+        self.assertEqual(list(zip(starts, ends)), segment(samples))
+
+    def test_silence_has_no_utterances(self):
+        rng = np.random.default_rng(0)
+        hiss = rng.normal(0, 60, 10 * SAMPLE_RATE).astype(np.int16)
+        self.assertEqual(segment(hiss), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text Injection Backends
+Text ko cursor par daalne ke alag-alag tareeke, sabse tez wala apne aap chuna jaata hai.
+
+    sendinput  - Windows: poora text ek hi SendInput call me (Hindi bhi)
+    xdotool    - Linux/X11: `xdotool type` batch me
+    pyautogui  - English (ASCII) text, bina per-character delay ke
+    clipboard  - Kahin bhi chalta hai: copy -> Ctrl+V -> purana clipboard wapas
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+from latency_trace import tracer
+
+try:
+    import pyautogui
+    from clipboard_paste import ClipboardNotReady, paste_text
+    AUTOMATION_AVAILABLE = True
+except ImportError:
+    AUTOMATION_AVAILABLE = False
+
+    class ClipboardNotReady(RuntimeError):
+        """Placeholder: without the clipboard backend it is never raised"""
+
+
+class InjectionBackend:
+    """Base class: one way of getting text into the focused window"""
+
+    name = 'base'
+
+    def available(self):
+        """Can this backend run on this machine right now?"""
+        return False
+
+    def supports(self, text):
+        """Can this backend type this particular text correctly?"""
+        return True
+
+    def inject(self, text):
+        raise NotImplementedError
+
+
+class SendInputBackend(InjectionBackend):
+    """Windows SendInput with KEYEVENTF_UNICODE, all characters in one batch"""
+
+    name = 'sendinput'
+    BATCH_EVENTS = 2000
+
+    def available(self):
+        return sys.platform == 'win32'
+
+    def _structures(self):
+        import ctypes
+        from ctypes import wintypes
+
+        ulong_ptr = ctypes.c_size_t
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [('wVk', wintypes.WORD), ('wScan', wintypes.WORD),
+                        ('dwFlags', wintypes.DWORD), ('time', wintypes.DWORD),
+                        ('dwExtraInfo', ulong_ptr)]
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [('dx', wintypes.LONG), ('dy', wintypes.LONG),
+                        ('mouseData', wintypes.DWORD), ('dwFlags', wintypes.DWORD),
+                        ('time', wintypes.DWORD), ('dwExtraInfo', ulong_ptr)]
+
+        class INPUTUNION(ctypes.Union):
+            _fields_ = [('ki', KEYBDINPUT), ('mi', MOUSEINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [('type', wintypes.DWORD), ('union', INPUTUNION)]
+
+        return ctypes, KEYBDINPUT, INPUTUNION, INPUT
+
+    def inject(self, text):
+        ctypes, KEYBDINPUT, INPUTUNION, INPUT = self._structures()
+        INPUT_KEYBOARD = 1
+        KEYEVENTF_KEYUP = 0x0002
+        KEYEVENTF_UNICODE = 0x0004
+        VK_RETURN = 0x0D
+
+        events = []
+        utf16 = text.replace('\r\n', '\n').encode('utf-16-le')
+        for i in range(0, len(utf16), 2):
+            unit = int.from_bytes(utf16[i:i + 2], 'little')
+            if unit == 0x0A:
+                # Newline as a real Enter key press
+                down = KEYBDINPUT(VK_RETURN, 0, 0, 0, 0)
+                up = KEYBDINPUT(VK_RETURN, 0, KEYEVENTF_KEYUP, 0, 0)
+            else:
+                down = KEYBDINPUT(0, unit, KEYEVENTF_UNICODE, 0, 0)
+                up = KEYBDINPUT(0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP, 0, 0)
+            events.append(INPUT(INPUT_KEYBOARD, INPUTUNION(ki=down)))
+            events.append(INPUT(INPUT_KEYBOARD, INPUTUNION(ki=up)))
+
+        send_input = ctypes.windll.user32.SendInput
+        for start in range(0, len(events), self.BATCH_EVENTS):
+            chunk = events[start:start + self.BATCH_EVENTS]
+            array = (INPUT * len(chunk))(*chunk)
+            sent = send_input(len(chunk), array, ctypes.sizeof(INPUT))
+            if sent != len(chunk):
+                raise OSError(f"SendInput blocked after {sent} events")
+
+
+class XdotoolBackend(InjectionBackend):
+    """X11 `xdotool type`, text passed on stdin in one call"""
+
+    name = 'xdotool'
+
+    def __init__(self, delay_ms=0):
+        self.delay_ms = delay_ms
+
+    def available(self):
+        return (sys.platform.startswith('linux')
+                and bool(os.environ.get('DISPLAY'))
+                and shutil.which('xdotool') is not None)
+
+    def inject(self, text):
+        subprocess.run(
+            ['xdotool', 'type', '--clearmodifiers', '--delay', str(self.delay_ms), '--file', '-'],
+            input=text.encode('utf-8'),
+            check=True,
+        )
+
+
+class PyAutoGuiBackend(InjectionBackend):
+    """pyautogui.write with no per-character interval (ASCII only)"""
+
+    name = 'pyautogui'
+
+    def available(self):
+        return AUTOMATION_AVAILABLE
+
+    def supports(self, text):
+        return all(ord(c) < 128 for c in text)
+
+    def inject(self, text):
+        pyautogui.write(text, interval=0, _pause=False)
+
+
+class ClipboardBackend(InjectionBackend):
+    """Copy + Ctrl+V, restoring whatever was on the clipboard before"""
+
+    name = 'clipboard'
+
+    def available(self):
+        return AUTOMATION_AVAILABLE
+
+    def inject(self, text):
+        paste_text(text)
+
+
+# Fastest first; clipboard is the fallback that works everywhere
+BACKENDS = [SendInputBackend(), XdotoolBackend(), PyAutoGuiBackend(), ClipboardBackend()]
+
+
+def get_backend(name):
+    """Backend by name, or None"""
+    for backend in BACKENDS:
+        if backend.name == name:
+            return backend
+    return None
+
+
+def usable_backends(text, preferred='auto'):
+    """Available backends that can type `text`, best first
+
+    `preferred` (from config 'typing_backend') comes first when it is usable.
+    """
+    usable = [b for b in BACKENDS if b.available() and b.supports(text)]
+    if preferred and preferred != 'auto':
+        usable.sort(key=lambda b: b.name != preferred)
+    return usable
+
+
+def select_backend(text, preferred='auto'):
+    """Pick the fastest available backend that can type `text`"""
+    usable = usable_backends(text, preferred)
+    if not usable:
+        raise RuntimeError("No text injection backend available")
+    return usable[0]
+
+
+def inject_text(text, preferred='auto'):
+    """Type `text` at the cursor with the best backend; returns its name
+
+    When the clipboard never takes the text (nothing was pasted), the next
+    usable backend types it instead.
+    """
+    usable = usable_backends(text, preferred)
+    if not usable:
+        raise RuntimeError("No text injection backend available")
+    for backend in usable:
+        try:
+            with tracer.span('inject'):
+                backend.inject(text)
+            return backend.name
+        except ClipboardNotReady as e:
+            if backend is usable[-1]:
+                raise
+            print(f"⚠️  {backend.name}: {e} - trying the next backend")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcript Store
+Jo bhi bola gaya woh disk par save hota hai (append-only log) aur
+SQLite full-text index se turant search ho jaata hai.
+
+Usage:
+    python transcript_store.py search "meeting notes"
+    python transcript_store.py search --since 2026-10-01 --until 2026-10-18
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transcripts')
+INDEX_FILE = 'index.sqlite3'
+SEGMENT_PATTERN = 'segment-{:06d}.jsonl'
+
+
+class TranscriptStore:
+    """Append-only segmented transcript log with an FTS index
+
+    `append()` only puts the record on a queue, so callers (recording thread,
+    HTTP handler) never wait on disk. A single writer thread batches records,
+    writes them to the current segment file, fsyncs according to `fsync`
+    ('always' = every batch, 'never' = leave it to the OS) and indexes them.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, fsync='always', flush_interval=1.0,
+                 batch_size=256, segment_bytes=8 * 1024 * 1024):
+        self.directory = directory
+        self.fsync = fsync
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.segment_bytes = segment_bytes
+        self.queue = queue.Queue()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._segment_file = None
+        self._segment_name = None
+        self._segment_number = 0
+        self._stopped = threading.Event()
+
+        # Schema is created here so search() works before the first write
+        conn = self._connect()
+        self.fts_available = self._create_schema(conn)
+        conn.close()
+
+        self.thread = threading.Thread(target=self._run, name="TranscriptWriter", daemon=True)
+        self.thread.start()
+
+    # ----- public API -------------------------------------------------
+
+    def append(self, text, source='', language=None, confidence=None, timestamp=None):
+        """Queue one phrase for storage (never blocks on disk)"""
+        if not text:
+            return
+        self.queue.put({
+            'ts': timestamp if timestamp is not None else time.time(),
+            'source': source,
+            'language': language,
+            'confidence': confidence,
+            'text': text,
+        })
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is written and indexed"""
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending records and stop the writer thread"""
+        if not self._stopped.is_set():
+            self.flush()
+            self._stopped.set()
+            self.queue.put(None)
+            self.thread.join(timeout=5.0)
+
+    def search(self, query=None, since=None, until=None, limit=50):
+        """Find phrases by keywords and/or time range (newest first)
+
+        `query` uses FTS5 syntax ("exact phrase", word*, a OR b).
+        `since`/`until` are epoch seconds.
+        """
+        conditions = []
+        params = []
+        if query:
+            if self.fts_available:
+                conditions.append("p.id IN (SELECT rowid FROM phrases_fts WHERE phrases_fts MATCH ?)")
+                params.append(query)
+            else:
+                conditions.append("p.text LIKE ?")
+                params.append(f"%{query}%")
+        if since is not None:
+            conditions.append("p.ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("p.ts < ?")
+            params.append(until)
+
+        sql = "SELECT p.ts, p.source, p.language, p.confidence, p.text FROM phrases p"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY p.ts DESC LIMIT ?"
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [
+            {'ts': r[0], 'source': r[1], 'language': r[2], 'confidence': r[3], 'text': r[4]}
+            for r in rows
+        ]
+
+    # ----- writer thread ----------------------------------------------
+
+    def _connect(self):
+        conn = sqlite3.connect(os.path.join(self.directory, INDEX_FILE), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_schema(self, conn):
+        """Create tables; returns False if this SQLite has no FTS5"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS phrases (
+                id INTEGER PRIMARY KEY,
+                ts REAL NOT NULL,
+                source TEXT,
+                language TEXT,
+                confidence REAL,
+                text TEXT NOT NULL,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL
+            )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS phrases_ts ON phrases(ts)")
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS phrases_fts
+                USING fts5(text, content='phrases', content_rowid='id')""")
+            fts = True
+        except sqlite3.OperationalError:
+            print("[WARN] SQLite FTS5 not available, search will be slower")
+            fts = False
+        conn.commit()
+        return fts
+
+    def _open_segment(self):
+        """Continue the newest segment, or start a new one if it is full"""
+        segments = sorted(glob.glob(os.path.join(self.directory, 'segment-*.jsonl')))
+        if segments:
+            self._segment_number = int(os.path.basename(segments[-1])[8:14])
+            if os.path.getsize(segments[-1]) >= self.segment_bytes:
+                self._segment_number += 1
+        else:
+            self._segment_number = 1
+        self._segment_name = SEGMENT_PATTERN.format(self._segment_number)
+        self._segment_file = open(os.path.join(self.directory, self._segment_name), 'ab')
+
+    def _rotate_if_needed(self):
+        if self._segment_file.tell() >= self.segment_bytes:
+            self._segment_file.close()
+            self._segment_number += 1
+            self._segment_name = SEGMENT_PATTERN.format(self._segment_number)
+            self._segment_file = open(os.path.join(self.directory, self._segment_name), 'ab')
+
+    def _index(self, conn, rows):
+        """Insert (record, segment, offset) rows into the index"""
+        for record, segment, offset in rows:
+            cursor = conn.execute(
+                "INSERT INTO phrases (ts, source, language, confidence, text, segment, offset) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record['ts'], record.get('source'), record.get('language'),
+                 record.get('confidence'), record['text'], segment, offset),
+            )
+            if self.fts_available:
+                conn.execute(
+                    "INSERT INTO phrases_fts (rowid, text) VALUES (?, ?)",
+                    (cursor.lastrowid, record['text']),
+                )
+        conn.commit()
+
+    def _catch_up(self, conn):
+        """Index log lines that were written but not indexed (e.g. after a crash)"""
+        row = conn.execute(
+            "SELECT segment, offset FROM phrases ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        last_segment, last_offset = row if row else ('', -1)
+
+        pending = []
+        for path in sorted(glob.glob(os.path.join(self.directory, 'segment-*.jsonl'))):
+            name = os.path.basename(path)
+            if name < last_segment:
+                continue
+            with open(path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    line_offset = offset
+                    offset += len(line)
+                    if name == last_segment and line_offset <= last_offset:
+                        continue
+                    if not line.endswith(b'\n'):
+                        break  # Torn write at the end of the log
+                    try:
+                        pending.append((json.loads(line), name, line_offset))
+                    except ValueError:
+                        continue
+        if pending:
+            self._index(conn, pending)
+            print(f"📚 Transcript index caught up ({len(pending)} phrases)")
+
+    def _write_batch(self, conn, batch):
+        rows = []
+        for record in batch:
+            self._rotate_if_needed()
+            offset = self._segment_file.tell()
+            line = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+            self._segment_file.write(line)
+            rows.append((record, self._segment_name, offset))
+        self._segment_file.flush()
+        if self.fsync == 'always':
+            os.fsync(self._segment_file.fileno())
+        self._index(conn, rows)
+
+    def _run(self):
+        conn = self._connect()
+        self._catch_up(conn)
+        self._open_segment()
+
+        running = True
+        while running:
+            batch = []
+            waiters = []
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    print(f"❌ Transcript write error: {e}")
+            for waiter in waiters:
+                waiter.set()
+
+        self._segment_file.close()
+        conn.close()
+
+
+def parse_date(value):
+    """YYYY-MM-DD (or full ISO time) -> epoch seconds"""
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search saved voice transcripts")
+    sub = parser.add_subparsers(dest='command', required=True)
+    search = sub.add_parser('search')
+    search.add_argument('query', nargs='?', help="keywords (FTS5 syntax)")
+    search.add_argument('--since', type=parse_date, help="YYYY-MM-DD")
+    search.add_argument('--until', type=parse_date, help="YYYY-MM-DD")
+    search.add_argument('--limit', type=int, default=50)
+    search.add_argument('--dir', default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    store = TranscriptStore(args.dir)
+    start = time.perf_counter()
+    results = store.search(args.query, args.since, args.until, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    store.close()
+
+    for r in reversed(results):
+        when = datetime.fromtimestamp(r['ts']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"[{when}] ({r['source']}, {r['language']}) {r['text']}")
+    print(f"\n{len(results)} result(s) in {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI Thread
+Poore app me ek hi Tk root, apne thread par, hamesha chalu. Baaki threads (hotkey,
+recording, recognition) sirf command queue me kaam daalte hain - Tk ko seedha nahi
+chhoote. Recording indicator aur notification window ek baar bante hain, phir sirf
+dikhaye/chhupaye jaate hain.
+"""
+
+import queue
+import threading
+
+try:
+    import tkinter as tk
+    from tkinter import messagebox
+except ImportError:
+    tk = None
+
+POLL_MS = 20   # How often the UI thread looks for new commands
+
+
+class RecordingIndicator:
+    """Red pulsing 'Recording...' box in the top-right corner"""
+
+    COLORS = ('#ff4444', '#ff6666')
+
+    def __init__(self, root, width=200, height=60):
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.title("Recording...")
+        self.window.attributes('-topmost', True)
+        self.window.configure(bg=self.COLORS[0])
+        x_position = self.window.winfo_screenwidth() - width - 20
+        self.window.geometry(f"{width}x{height}+{x_position}+20")
+        self.label = tk.Label(self.window, text="🎤 Recording...", font=('Arial', 14, 'bold'),
+                              bg=self.COLORS[0], fg='white')
+        self.label.pack(expand=True)
+        self._pulse_job = None
+        self._phase = 0
+
+    def show(self):
+        if self._pulse_job is None:
+            self.window.deiconify()
+            self._pulse()
+
+    def hide(self):
+        if self._pulse_job is not None:
+            self.window.after_cancel(self._pulse_job)
+            self._pulse_job = None
+        self.window.withdraw()
+
+    def _pulse(self):
+        self._phase ^= 1
+        color = self.COLORS[self._phase]
+        self.window.configure(bg=color)
+        self.label.configure(bg=color)
+        self._pulse_job = self.window.after(500, self._pulse)
+
+
+class Notification:
+    """Toast in the bottom-right corner; a new message replaces the current one"""
+
+    def __init__(self, root, width=250, height=80):
+        self.window = tk.Toplevel(root)
+        self.window.withdraw()
+        self.window.title("Voice Typer")
+        self.window.attributes('-topmost', True)
+        self.window.geometry("{}x{}+{}+{}".format(
+            width, height,
+            self.window.winfo_screenwidth() - width - 20,
+            self.window.winfo_screenheight() - height - 40,
+        ))
+        self.label = tk.Label(self.window, font=('Arial', 12, 'bold'))
+        self.label.pack(expand=True)
+        self._hide_job = None
+
+    def show(self, message, duration_ms=2000):
+        self.label.configure(text=message)
+        if self._hide_job is not None:
+            self.window.after_cancel(self._hide_job)
+        self.window.deiconify()
+        self._hide_job = self.window.after(duration_ms, self.hide)
+
+    def hide(self):
+        self._hide_job = None
+        self.window.withdraw()
+
+
+class UIThread:
+    """Owns the only Tk root; every other thread talks to it through `call()`
+
+    Commands are (function, args) pairs run in order on the UI thread.
+    Without a display (or without tkinter) the app keeps working and UI
+    commands are simply dropped.
+    """
+
+    def __init__(self):
+        self.commands = queue.Queue()
+        self.available = False
+        self.root = None
+        self.indicator = None
+        self.notification = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="UI", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def _run(self):
+        try:
+            self.root = tk.Tk()
+            self.root.withdraw()
+            self.indicator = RecordingIndicator(self.root)
+            self.notification = Notification(self.root)
+            self.available = True
+        except Exception as e:
+            print(f"⚠️  No UI (indicator/notifications off): {e}")
+            return
+        finally:
+            self._ready.set()
+        self.root.after(POLL_MS, self._drain)
+        self.root.mainloop()
+
+    def _drain(self):
+        # Next poll first: a command that blocks (a modal dialog runs its own event loop)
+        # must not stop later commands from being picked up
+        self.root.after(POLL_MS, self._drain)
+        while True:
+            try:
+                func, args = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"❌ UI error: {e}")
+
+    def call(self, func, *args):
+        """Run `func(*args)` on the UI thread (safe from any thread, never blocks)"""
+        if self.available:
+            self.commands.put((func, args))
+
+    def show_indicator(self):
+        self.call(lambda: self.indicator.show())
+
+    def hide_indicator(self):
+        self.call(lambda: self.indicator.hide())
+
+    def notify(self, message):
+        self.call(lambda: self.notification.show(message))
+
+    def message_box(self, title, text):
+        # Opened as its own Tk callback, not inside _drain
+        self.call(lambda: self.root.after(0, lambda: messagebox.showinfo(title, text, parent=self.root)))
+
+    def stop(self):
+        self.call(self.root.quit)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Voice Activity Detection (NumPy)
+Audio ke poore block par ek saath features nikalte hain (RMS, zero-crossing rate,
+spectral flatness) aur bolna kab shuru/khatam hua yeh tay hota hai.
+Chup hone ke ~200 ms baad utterance band - fixed 0.8 s pause ka intezaar nahi.
+"""
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+
+def frame_features(samples):
+    """Per-frame (rms, zcr, flatness) for int16 samples, all frames at once
+
+    zcr is the fraction of sign changes; flatness is geometric/arithmetic
+    mean of the power spectrum (1.0 = white noise, near 0 = tonal/voiced).
+    """
+    usable = len(samples) - len(samples) % FRAME_SAMPLES
+    frames = samples[:usable].astype(np.float32).reshape(-1, FRAME_SAMPLES)
+    if len(frames) == 0:
+        empty = np.empty(0, dtype=np.float32)
+        return empty, empty, empty
+
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (FRAME_SAMPLES - 1)
+
+    window = np.hanning(FRAME_SAMPLES).astype(np.float32)
+    power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2 + 1e-10
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+    return rms, zcr, flatness
+
+
+class VoiceActivityDetector:
+    """Frame-level speech/non-speech decisions
+
+    A frame is speech when it is clearly above the noise threshold and
+    either voiced (low spectral flatness) or a fricative (high zcr with
+    extra energy). `energy_threshold=None` tracks the noise floor itself.
+    """
+
+    def __init__(self, energy_threshold=None, threshold_ratio=3.0, min_threshold=150.0,
+                 max_flatness=0.45, fricative_zcr=0.3):
+        self.energy_threshold = energy_threshold
+        self.threshold_ratio = threshold_ratio
+        self.min_threshold = min_threshold
+        self.max_flatness = max_flatness
+        self.fricative_zcr = fricative_zcr
+        self.noise_floor = None
+
+    def threshold(self):
+        if self.energy_threshold is not None:
+            return self.energy_threshold
+        return max(self.min_threshold, (self.noise_floor or 0.0) * self.threshold_ratio)
+
+    def classify(self, samples):
+        """Boolean speech mask, one entry per 20 ms frame"""
+        rms, zcr, flatness = frame_features(samples)
+        if len(rms) == 0:
+            return np.zeros(0, dtype=bool)
+
+        if self.energy_threshold is None and self.noise_floor is None:
+            # First block: the quietest tenth is a fair noise estimate
+            self.noise_floor = float(np.percentile(rms, 10))
+
+        limit = self.threshold()
+        loud = rms > limit
+        voiced = flatness < self.max_flatness
+        fricative = (zcr > self.fricative_zcr) & (rms > 2 * limit)
+        speech = loud & (voiced | fricative)
+
+        if self.energy_threshold is None:
+            quiet = rms[~speech]
+            if len(quiet):
+                self.noise_floor += (float(np.median(quiet)) - self.noise_floor) * 0.1
+        return speech
+
+
+class Endpointer:
+    """Turns frame decisions into utterance start/end events, block by block
+
+    Work is done per run of equal decisions (found with np.diff), not per
+    frame. An utterance starts after `onset_ms` of speech and ends after
+    `end_silence_ms` of non-speech (the hangover). `padding_ms` of audio is
+    added on both sides so word edges are not clipped.
+    """
+
+    def __init__(self, vad=None, onset_ms=60, end_silence_ms=200, padding_ms=100,
+                 max_utterance_s=30.0):
+        self.vad = vad or VoiceActivityDetector()
+        self.onset_frames = max(1, onset_ms // FRAME_MS)
+        self.end_frames = max(1, end_silence_ms // FRAME_MS)
+        self.padding_frames = padding_ms // FRAME_MS
+        self.max_frames = int(max_utterance_s * 1000 // FRAME_MS)
+
+        self.frame = 0            # Absolute index of the next frame
+        self.in_speech = False
+        self.utterance_start = 0
+        self.run_value = False
+        self.run_start = 0
+        self._pending = np.zeros(0, dtype=np.int16)
+
+    def process(self, samples):
+        """Feed int16 samples; returns [('start'|'end', sample_index), ...]"""
+        if len(self._pending):
+            samples = np.concatenate([self._pending, samples])
+        usable = len(samples) - len(samples) % FRAME_SAMPLES
+        self._pending = samples[usable:]
+        decisions = self.vad.classify(samples[:usable])
+        return self._process_decisions(decisions)
+
+    def _process_decisions(self, decisions):
+        events = []
+        if len(decisions) == 0:
+            return events
+
+        base = self.frame
+        # Runs of equal decisions inside this block
+        changes = np.flatnonzero(decisions[1:] != decisions[:-1]) + 1
+        starts = np.concatenate([[0], changes])
+        ends = np.concatenate([changes, [len(decisions)]])
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            value = bool(decisions[start])
+            if value != self.run_value:
+                self.run_value = value
+                self.run_start = base + start
+            # else: the first run continues the one carried from the last block
+            self._check(base + end, events)
+
+        self.frame = base + len(decisions)
+        return events
+
+    def _check(self, upto, events):
+        """Fire events that became due somewhere in the current run before `upto`"""
+        while True:
+            length = upto - self.run_start
+            if self.run_value and not self.in_speech and length >= self.onset_frames:
+                self.in_speech = True
+                self.utterance_start = max(0, self.run_start - self.padding_frames)
+                events.append(('start', self.utterance_start * FRAME_SAMPLES))
+            elif not self.run_value and self.in_speech and length >= self.end_frames:
+                self.in_speech = False
+                end = self.run_start + self.padding_frames
+                events.append(('end', end * FRAME_SAMPLES))
+            elif self.in_speech and upto - self.utterance_start >= self.max_frames:
+                # Too long: cut here and carry on with a new utterance
+                cut = self.utterance_start + self.max_frames
+                events.append(('end', cut * FRAME_SAMPLES))
+                events.append(('start', cut * FRAME_SAMPLES))
+                self.utterance_start = cut
+                continue
+            return
+
+    def flush(self):
+        """Close an utterance still open at the end of the audio"""
+        if self.in_speech:
+            self.in_speech = False
+            return [('end', self.frame * FRAME_SAMPLES)]
+        return []
+
+
+def segment(samples, **endpointer_options):
+    """Offline: list of (start_sample, end_sample) utterances in `samples`"""
+    endpointer = Endpointer(**endpointer_options)
+    events = endpointer.process(np.asarray(samples, dtype=np.int16)) + endpointer.flush()
+    segments = []
+    start = None
+    for kind, position in events:
+        if kind == 'start':
+            start = position
+        elif start is not None:
+            segments.append((start, min(position, len(samples))))
+            start = None
+    return segments
+
+
+class UtteranceSegmenter:
+    """Cuts a continuous int16 stream into utterances, chunk by chunk
+
+    Audio is kept only from the start of the current utterance (or the
+    last `keep_ms` while silent), so memory stays bounded however long
+    the stream runs.
+    """
+
+    def __init__(self, endpointer=None, keep_ms=500):
+        self.endpointer = endpointer or Endpointer()
+        self.keep = keep_ms * SAMPLE_RATE // 1000
+        self._chunks = []
+        self._offset = 0          # Absolute index of the first kept sample
+        self._total = 0           # Samples fed so far
+        self._start = None
+
+    def feed(self, samples):
+        """Feed int16 samples; returns finished utterances (int16 arrays)"""
+        self._chunks.append(samples)
+        self._total += len(samples)
+        done = []
+        for kind, position in self.endpointer.process(samples):
+            if kind == 'start':
+                self._start = position
+            elif self._start is not None:
+                done.append(self._slice(self._start, min(position, self._total)))
+                self._start = None
+        self._trim()
+        return done
+
+    def flush(self):
+        """The utterance still open at the end of the stream, if any"""
+        done = []
+        if self._start is not None and self.endpointer.flush():
+            done.append(self._slice(self._start, self._total))
+            self._start = None
+        return done
+
+    def _slice(self, start, end):
+        audio = np.concatenate(self._chunks) if len(self._chunks) > 1 else self._chunks[0]
+        self._chunks = [audio]
+        return audio[max(0, start - self._offset):end - self._offset].copy()
+
+    def _trim(self):
+        """Drop whole chunks nobody can need any more"""
+        keep_from = self._start if self._start is not None else self._total - self.keep
+        while len(self._chunks) > 1 and self._offset + len(self._chunks[0]) <= keep_from:
+            self._offset += len(self._chunks.pop(0))
+
+
+def listen(source, endpointer=None, timeout=10, phrase_time_limit=15, encoder=None):
+    """VAD-endpointed replacement for Recognizer.listen on a 16 kHz source
+
+    Reads from `source.stream` until the endpointer closes the utterance,
+    the source stops, or `phrase_time_limit` passes. Raises
+    speech_recognition.WaitTimeoutError if no speech starts in `timeout`.
+
+    With an `encoder` (audio_encoder.FlacStreamEncoder) the utterance is
+    compressed while it is being spoken and an EncodedAudioData is
+    returned. Audio is only handed over once it is certain to be inside
+    the utterance (the end can still move back by the end-silence time).
+    """
+    import speech_recognition as sr
+
+    endpointer = endpointer or Endpointer()
+    chunks = []
+    total = 0          # Samples read so far (same origin as endpointer positions)
+    start_at = None
+    end_at = None
+    encoded = None     # Samples already given to the encoder
+    hold = (endpointer.end_frames + 1) * FRAME_SAMPLES
+
+    def encode_until(position):
+        nonlocal encoded
+        begin = start_at if encoded is None else encoded
+        if position > begin:
+            audio = np.concatenate(chunks)
+            encoder.write(audio[begin:position])
+            encoded = position
+
+    try:
+        while end_at is None:
+            data = source.stream.read(source.CHUNK)
+            if not data:
+                break
+            chunk = np.frombuffer(data, dtype='<i2')
+            chunks.append(chunk)
+            total += len(chunk)
+            for kind, position in endpointer.process(chunk):
+                if kind == 'start' and start_at is None:
+                    start_at = position
+                elif kind == 'end' and start_at is not None:
+                    end_at = position
+                    break
+
+            if start_at is None and timeout and total / SAMPLE_RATE >= timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if start_at is not None and phrase_time_limit and (total - start_at) / SAMPLE_RATE >= phrase_time_limit:
+                break
+            if encoder is not None and start_at is not None and end_at is None:
+                encode_until(total - hold)
+
+        audio = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+        if encoder is None:
+            audio = audio[(start_at or 0):(end_at or total)]
+            return sr.AudioData(audio.astype('<i2').tobytes(), SAMPLE_RATE, 2)
+
+        if start_at is None:
+            start_at = 0
+        encode_until(end_at or total)
+        from audio_encoder import EncodedAudioData
+        audio = audio[start_at:(end_at or total)]
+        return EncodedAudioData(audio.astype('<i2').tobytes(), SAMPLE_RATE, 2,
+                                encoder.finish(), encoder.sample_rate)
+    except BaseException:
+        if encoder is not None:
+            encoder.abort()
+        raise
@@ -17,41 +17,92 @@ if sys.platform == 'win32':
 import json
 import threading
 import time
-import tkinter as tk
-from tkinter import messagebox
 import speech_recognition as sr
 import pyautogui
-import pyperclip
 from pystray import Icon, Menu, MenuItem
 from PIL import Image
 import keyboard
+import numpy as np
+
+from transcript_store import TranscriptStore
+from incremental_typer import IncrementalTyper
+from text_injection import inject_text
+from audio_stream import ContinuousMicrophone
+from noise_floor import NoiseFloorTracker, NoiseFloorMonitor
+import vad
+from dictation_pipeline import DictationPipeline
+from recognition_engines import load_engine
+from chunked_recognition import ChunkedRecognizer, ChunkWindower
+from auto_language import AutoLanguageRecognizer, LanguagePriors
+from resilient_recognition import RecognitionSpool
+from latency_trace import tracer
+from audio_encoder import FlacStreamEncoder, encode_samples, upload_stats
+from ui_thread import UIThread
 
 # Configuration file path
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'config.json')
 ICON_FILE = os.path.join(os.path.dirname(__file__), 'icon.png')
+LATENCY_LOG = os.path.join(os.path.dirname(__file__), 'latency_spans.jsonl')
 
 class VoiceTyperApp:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
         self.is_recording = False
+        self.capture = None
         self.recording_thread = None
-        self.indicator_window = None
+        self.pipeline = None
+        
+        # One Tk root on its own thread; indicator and notifications are reused
+        self.ui = UIThread().start()
+        
+        # Types only the changed part when a hypothesis is revised
+        self.live_typer = IncrementalTyper(self.insert_text, self.delete_chars)
         
         # Load configuration
         self.load_config()
         
+        # Per-stage timing spans; optionally every span to a JSONL file
+        if self.config.get('latency_log', False):
+            tracer.enable_log(LATENCY_LOG)
+        
+        # Recognition engine (Google / offline Vosk / whisper.cpp), loaded once
+        self.engine = load_engine(self.config)
+        # Online engine: audio is FLAC-encoded while still capturing (None = send as is)
+        self.upload_sample_rate = self.upload_rate()
+        
+        # Everything recognized is saved to disk (searchable later)
+        self.transcripts = None
+        if self.config.get('save_transcripts', True):
+            self.transcripts = TranscriptStore()
+        
         # Language settings
         self.languages = {
             'en-US': 'English',
-            'hi-IN': 'हिंदी'
+            'hi-IN': 'हिंदी',
+            'auto': 'Auto (English + हिंदी)'
         }
         
+        # Auto mode: both languages at once, the more confident result wins
+        self.language_priors = LanguagePriors.from_config(self.config, ['en-US', 'hi-IN'])
+        self.auto_language = AutoLanguageRecognizer(self.engine, self.language_priors)
+        
         # Adjust recognizer settings for better accuracy
-        self.recognizer.energy_threshold = 4000
         self.recognizer.dynamic_energy_threshold = True
         self.recognizer.pause_threshold = 0.8
         
+        # Audio the recognizer could not handle waits on disk and is retried later
+        self.spool = RecognitionSpool(self.recognize_spooled, self.on_recovered).start()
+        
+        # Microphone stays open; each recording starts with a little pre-roll audio
+        self.mic_stream = ContinuousMicrophone().start()
+        
+        # Room noise is learned from idle audio, remembered across sessions
+        self.noise_floor = NoiseFloorTracker.from_config(self.config)
+        self.noise_floor.apply(self.recognizer)
+        self.noise_monitor = NoiseFloorMonitor(
+            self.mic_stream, self.noise_floor, lambda: not self.is_recording
+        ).start()
+        
         # Setup system tray icon
         self.setup_tray_icon()
         
@@ -75,7 +126,23 @@ class VoiceTyperApp:
                 'hotkey_record': 'ctrl+shift+space',
                 'hotkey_language_toggle': 'ctrl+shift+l',
                 'auto_send': True,
-                'show_notifications': True
+                'show_notifications': True,
+                'save_transcripts': True,
+                'typing_backend': 'auto',
+                'preroll_seconds': 0.3,
+                'endpoint_silence_ms': 200,
+                'hotkey_continuous': 'ctrl+shift+d',
+                'recognition_workers': 3,
+                'recognition_engine': 'google',
+                'chunked_recognition': False,
+                'chunked_end_silence_s': 3.0,
+                'chunked_partial_s': 1.0,
+                'recognition_cache': True,
+                'recognition_deadline_s': 8.0,
+                'hedge_engine': None,
+                'latency_log': False,
+                'compressed_upload': True,
+                'upload_sample_rate': None
             }
             self.save_config()
     
@@ -85,11 +152,11 @@ class VoiceTyperApp:
             json.dump(self.config, f, indent=2, ensure_ascii=False)
     
     def toggle_language(self):
-        """Toggle between Hindi and English"""
-        if self.config['language'] == 'en-US':
-            self.config['language'] = 'hi-IN'
-        else:
-            self.config['language'] = 'en-US'
+        """Cycle English -> Hindi -> Auto"""
+        order = list(self.languages)
+        current = self.config['language']
+        index = order.index(current) if current in order else -1
+        self.config['language'] = order[(index + 1) % len(order)]
         
         self.save_config()
         lang_name = self.languages[self.config['language']]
@@ -102,71 +169,22 @@ class VoiceTyperApp:
         self.update_tray_menu()
     
     def show_notification(self, message):
-        """Show a temporary notification window"""
-        notification = tk.Tk()
-        notification.title("Voice Typer")
-        notification.attributes('-topmost', True)
-        notification.geometry("250x80+{}+{}".format(
-            notification.winfo_screenwidth() - 270,
-            notification.winfo_screenheight() - 120
-        ))
-        
-        label = tk.Label(notification, text=message, font=('Arial', 12, 'bold'))
-        label.pack(expand=True)
-        
-        notification.after(2000, notification.destroy)
-        notification.mainloop()
+        """Show a temporary notification (returns immediately)"""
+        self.ui.notify(message)
     
     def show_recording_indicator(self):
         """Show visual indicator when recording"""
-        self.indicator_window = tk.Tk()
-        self.indicator_window.title("Recording...")
-        self.indicator_window.attributes('-topmost', True)
-        self.indicator_window.configure(bg='#ff4444')
-        
-        # Position at top-right corner
-        window_width = 200
-        window_height = 60
-        screen_width = self.indicator_window.winfo_screenwidth()
-        x_position = screen_width - window_width - 20
-        y_position = 20
-        
-        self.indicator_window.geometry(f"{window_width}x{window_height}+{x_position}+{y_position}")
-        
-        # Recording label
-        label = tk.Label(
-            self.indicator_window,
-            text="🎤 Recording...",
-            font=('Arial', 14, 'bold'),
-            bg='#ff4444',
-            fg='white'
-        )
-        label.pack(expand=True)
-        
-        # Pulsing effect
-        def pulse():
-            if self.is_recording and self.indicator_window:
-                current_bg = self.indicator_window.cget('bg')
-                new_bg = '#ff6666' if current_bg == '#ff4444' else '#ff4444'
-                self.indicator_window.configure(bg=new_bg)
-                label.configure(bg=new_bg)
-                self.indicator_window.after(500, pulse)
-        
-        pulse()
-        self.indicator_window.mainloop()
+        self.ui.show_indicator()
     
     def hide_recording_indicator(self):
         """Hide recording indicator"""
-        if self.indicator_window:
-            try:
-                self.indicator_window.destroy()
-                self.indicator_window = None
-            except:
-                pass
+        self.ui.hide_indicator()
     
     def toggle_recording(self):
         """Start or stop recording"""
-        if not self.is_recording:
+        if self.pipeline:
+            self.stop_continuous()
+        elif not self.is_recording:
             self.start_recording()
         else:
             self.stop_recording()
@@ -177,15 +195,21 @@ class VoiceTyperApp:
             return
         
         self.is_recording = True
+        utterance = tracer.set_current(tracer.new_id())
+        pressed = time.perf_counter()
+        # Grab the capture right at the hotkey so nothing said from here is lost
+        with tracer.span('mic_open'):
+            self.capture = self.mic_stream.capture(preroll=self.config.get('preroll_seconds', 0.3))
+        with tracer.span('calibration'):
+            self.noise_floor.apply(self.recognizer)
         print("\n🎤 Recording started... Speak now!")
         
-        # Show indicator in separate thread
-        indicator_thread = threading.Thread(target=self.show_recording_indicator, daemon=True)
-        indicator_thread.start()
+        self.show_recording_indicator()
         
         # Start recording in separate thread
-        self.recording_thread = threading.Thread(target=self.record_and_type, daemon=True)
+        self.recording_thread = threading.Thread(target=self.record_and_type, args=(utterance,), daemon=True)
         self.recording_thread.start()
+        tracer.record('hotkey', time.perf_counter() - pressed)
     
     def stop_recording(self):
         """Stop voice recording"""
@@ -194,19 +218,33 @@ class VoiceTyperApp:
         
         self.is_recording = False
         print("⏹️  Recording stopped!")
+        if self.capture:
+            self.capture.stop()  # listen() returns what was said so far
         self.hide_recording_indicator()
     
-    def record_and_type(self):
+    def record_and_type(self, utterance=None):
         """Record audio and convert to text, then type it"""
+        tracer.set_current(utterance)
         try:
-            with self.microphone as source:
-                # Adjust for ambient noise
-                print("🔊 Adjusting for ambient noise... Please wait.")
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
+            # Opt-in: windows skip the 200 ms endpointer and the FLAC streamed while capturing
+            if self.config.get('chunked_recognition', False):
+                self.record_chunked()
+                return
+            
+            with tracer.span('capture'), self.capture as source:
                 print("✅ Listening...")
-                # Listen for audio
-                audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=15)
+                # Listen until ~200 ms of silence (NumPy VAD instead of the 0.8 s pause)
+                endpointer = vad.Endpointer(
+                    vad.VoiceActivityDetector(energy_threshold=self.noise_floor.threshold),
+                    end_silence_ms=self.config.get('endpoint_silence_ms', 200),
+                )
+                encoder = FlacStreamEncoder(self.upload_sample_rate) if self.upload_sample_rate else None
+                audio = vad.listen(source, endpointer, timeout=10, phrase_time_limit=15,
+                                   encoder=encoder)
+            captured = time.perf_counter()
+            if encoder:
+                # Only the tail of the FLAC was left to encode once speech ended
+                tracer.record('encode_finish', encoder.finish_seconds)
             
             # Stop recording after audio is captured
             self.is_recording = False
@@ -214,66 +252,237 @@ class VoiceTyperApp:
             
             print("🔄 Processing speech...")
             
-            # Recognize speech using Google Speech Recognition
+            # Recognize speech with the configured engine
             try:
-                text = self.recognizer.recognize_google(
-                    audio,
-                    language=self.config['language']
-                )
+                text, language = self.recognize_audio(audio)
                 
                 print(f"✅ Recognized: {text}")
                 
+                if self.transcripts:
+                    self.transcripts.append(text, source='desktop', language=language)
+                
                 # Type the text at cursor position
                 self.type_text(text)
+                tracer.record('speech_to_text', time.perf_counter() - captured)
                 
             except sr.UnknownValueError:
                 print("❌ Could not understand audio")
                 if self.config['show_notifications']:
-                    threading.Thread(
-                        target=self.show_notification,
-                        args=("Could not understand audio",),
-                        daemon=True
-                    ).start()
+                    self.show_notification("Could not understand audio")
             except sr.RequestError as e:
                 print(f"❌ Error with speech recognition service: {e}")
+                self.spool.add(audio, self.config['language'])
+                print("📦 Audio saved - will be recognized when the service is back")
                 if self.config['show_notifications']:
-                    threading.Thread(
-                        target=self.show_notification,
-                        args=("Speech recognition error",),
-                        daemon=True
-                    ).start()
+                    self.show_notification("Recognition failed - saved for later")
         
         except Exception as e:
             print(f"❌ Error during recording: {e}")
             self.is_recording = False
             self.hide_recording_indicator()
     
+    def record_chunked(self):
+        """Long dictation: text is typed window by window while still speaking
+        
+        Ends on the hotkey, after `chunked_end_silence_s` of silence, or if
+        nothing is said for 10 s. Only one window is held in memory. With
+        `chunked_partial_s`, the window still being spoken is shown early as
+        a provisional hypothesis and corrected in place (only changes typed).
+        """
+        threshold = self.noise_floor.threshold
+        committed = []
+        self.wait_for_modifiers_released()
+        
+        def on_text(piece):
+            committed.append(piece)
+            self.type_revision(' '.join(committed))
+        
+        def on_partial(piece):
+            self.type_revision(' '.join(committed + [piece]))
+        
+        partial_every = self.config.get('chunked_partial_s', 1.0)
+        chunked = ChunkedRecognizer(
+            self.recognize_utterance, on_text,
+            ChunkWindower(vad.VoiceActivityDetector(energy_threshold=threshold)),
+            on_partial=on_partial if partial_every else None,
+            partial_every_s=partial_every or 1.0,
+        )
+        endpointer = vad.Endpointer(
+            vad.VoiceActivityDetector(energy_threshold=threshold),
+            end_silence_ms=int(self.config.get('chunked_end_silence_s', 3.0) * 1000),
+            max_utterance_s=24 * 3600,
+        )
+        heard = False
+        waited = 0
+        with tracer.span('capture'), self.capture as source:
+            print("✅ Listening (long dictation)...")
+            while True:
+                data = source.stream.read(source.CHUNK)
+                if not data:
+                    break
+                samples = np.frombuffer(data, dtype='<i2')
+                chunked.feed(samples)
+                endpointer.process(samples)
+                if endpointer.in_speech:
+                    heard = True
+                elif heard:
+                    break
+                else:
+                    waited += len(samples)
+                    if waited >= 10 * vad.SAMPLE_RATE:
+                        print("⏱️  No speech heard")
+                        break
+        
+        self.is_recording = False
+        self.hide_recording_indicator()
+        text = chunked.finish()
+        # Drops a provisional tail that no final text replaced
+        self.type_revision(text, final=True)
+        if text:
+            print(f"✅ Recognized: {text}")
+            if self.transcripts:
+                self.transcripts.append(text, source='desktop', language=self.config['language'])
+    
+    def toggle_continuous(self):
+        """Start or stop hands-free dictation (phrase after phrase, until stopped)"""
+        if self.pipeline:
+            self.stop_continuous()
+        elif not self.is_recording:
+            self.start_continuous()
+    
+    def start_continuous(self):
+        """Capture, VAD, recognition and typing run as overlapping pipeline stages"""
+        self.is_recording = True
+        source = self.mic_stream.capture(preroll=self.config.get('preroll_seconds', 0.3))
+        segmenter = vad.UtteranceSegmenter(vad.Endpointer(
+            vad.VoiceActivityDetector(energy_threshold=self.noise_floor.threshold),
+            end_silence_ms=self.config.get('endpoint_silence_ms', 200),
+            max_utterance_s=15,
+        ))
+        self.pipeline = DictationPipeline(
+            source, self.recognize_utterance, self.output_text, segmenter,
+            workers=self.config.get('recognition_workers', 3),
+        ).start()
+        print("\n🎙️  Continuous dictation started... speak freely!")
+        self.show_recording_indicator()
+    
+    def stop_continuous(self):
+        """Stop listening; phrases already captured are still typed"""
+        pipeline, self.pipeline = self.pipeline, None
+        self.is_recording = False
+        pipeline.stop()
+        self.hide_recording_indicator()
+        print("⏹️  Continuous dictation stopped!")
+        
+        def report():
+            pipeline.join(timeout=30)
+            print(pipeline.format_stats())
+        threading.Thread(target=report, daemon=True).start()
+    
+    def show_pipeline_stats(self):
+        """Print per-stage latency, and throughput/queue depth of continuous dictation"""
+        print(tracer.format_summary())
+        if self.pipeline:
+            print(self.pipeline.format_stats())
+    
+    def recognize_audio(self, audio):
+        """(text, language) of one utterance; in auto mode both languages are tried"""
+        with tracer.span('recognition'):
+            if self.config['language'] == 'auto':
+                return self.auto_language.recognize(audio)
+            return self.engine.recognize(audio, self.config['language']), self.config['language']
+    
+    def upload_rate(self):
+        """Sample rate for compressed uploads; None for offline engines, when turned off or without flac"""
+        lowest = self.engine.upload_sample_rate
+        if not lowest or not self.config.get('compressed_upload', True):
+            return None
+        try:
+            sr.get_flac_converter()
+        except OSError as e:
+            print(f"⚠️  FLAC encoder unavailable ({e}) - uploading without pre-encoding")
+            return None
+        return max(lowest, self.config.get('upload_sample_rate') or lowest)
+    
+    def recognize_utterance(self, samples):
+        """Recognition stage: 16 kHz int16 samples -> text (None if not understood)"""
+        if self.upload_sample_rate:
+            # Window/utterance is complete already: encode (and resample) it in this worker
+            with tracer.span('encode'):
+                audio = encode_samples(samples, self.upload_sample_rate)
+        else:
+            audio = sr.AudioData(samples.astype('<i2').tobytes(), vad.SAMPLE_RATE, 2)
+        try:
+            return self.recognize_audio(audio)[0]
+        except sr.UnknownValueError:
+            print("❌ Could not understand audio")
+            return None
+        except sr.RequestError as e:
+            print(f"❌ Recognition failed, saved for later: {e}")
+            self.spool.add(audio, self.config['language'])
+            return None
+    
+    def recognize_spooled(self, audio, language):
+        """Spool retry: recognize saved audio in the language it was spoken in"""
+        if language == 'auto':
+            return self.auto_language.recognize(audio)[0]
+        return self.engine.recognize(audio, language)
+    
+    def on_recovered(self, text, language, timestamp):
+        """Spooled audio recognized at last: it goes into the transcript log"""
+        print(f"📦 Recovered from spool: {text}")
+        if self.transcripts:
+            self.transcripts.append(text, source='spool', language=language, timestamp=timestamp)
+    
+    def output_text(self, text):
+        """Output stage: save and type one recognized phrase"""
+        print(f"✅ Recognized: {text}")
+        if self.transcripts:
+            self.transcripts.append(text, source='desktop', language=self.config['language'])
+        self.type_text(text)
+    
     def type_text(self, text):
         """Type text at current cursor position"""
         try:
-            # Small delay to ensure cursor is ready
-            time.sleep(0.2)
+            # Wait only while hotkey modifiers are still held (they would turn text into shortcuts)
+            with tracer.span('modifier_wait'):
+                self.wait_for_modifiers_released()
             
-            # For Hindi and special characters, use clipboard method
-            if self.config['language'] == 'hi-IN' or any(ord(c) > 127 for c in text):
-                # Copy to clipboard
-                pyperclip.copy(text)
-                print("📋 Copied to clipboard...")
-                
-                # Paste using Ctrl+V
-                time.sleep(0.1)
-                pyautogui.hotkey('ctrl', 'v')
-                print("⌨️  Pasted!")
-            else:
-                # For English, direct typing is faster
-                pyautogui.write(text, interval=0.01)
-                print("⌨️  Typed!")
+            # Fastest backend that can type this text (SendInput / xdotool / clipboard)
+            backend = inject_text(text, self.config.get('typing_backend', 'auto'))
+            print(f"⌨️  Typed! ({backend})")
             
             print(f"{'='*50}\n")
             
         except Exception as e:
             print(f"❌ Error typing text: {e}")
     
+    def wait_for_modifiers_released(self, timeout=0.5):
+        """Return as soon as Ctrl/Shift/Alt are up (instead of a fixed sleep)"""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if not any(keyboard.is_pressed(key) for key in ('ctrl', 'shift', 'alt')):
+                return
+            time.sleep(0.01)
+    
+    def insert_text(self, text):
+        """Insert text at the cursor without the start-up delay of type_text"""
+        inject_text(text, self.config.get('typing_backend', 'auto'))
+    
+    def delete_chars(self, count):
+        """Delete `count` characters before the cursor"""
+        pyautogui.press('backspace', presses=count, _pause=False)
+    
+    def type_revision(self, text, final=False):
+        """Show a revised hypothesis by typing only what changed"""
+        try:
+            backspaces, suffix = self.live_typer.update(text)
+            print(f"✏️  Revision: -{backspaces} +{len(suffix)} chars")
+            if final:
+                self.live_typer.commit()
+        except Exception as e:
+            print(f"❌ Error typing revision: {e}")
+    
     def register_hotkeys(self):
         """Register global hotkeys"""
         try:
@@ -284,6 +493,13 @@ class VoiceTyperApp:
                 suppress=False
             )
             
+            # Register hands-free (continuous) dictation hotkey
+            keyboard.add_hotkey(
+                self.config.get('hotkey_continuous', 'ctrl+shift+d'),
+                self.toggle_continuous,
+                suppress=False
+            )
+            
             # Register language toggle hotkey
             keyboard.add_hotkey(
                 self.config['hotkey_language_toggle'],
@@ -330,6 +546,8 @@ class VoiceTyperApp:
         return Menu(
             MenuItem(f"Current: {current_lang}", lambda: None, enabled=False),
             MenuItem("Toggle Language (Ctrl+Shift+L)", self.toggle_language),
+            MenuItem("Continuous Dictation (Ctrl+Shift+D)", self.toggle_continuous),
+            MenuItem("Dictation Stats", self.show_pipeline_stats),
             MenuItem("About", self.show_about),
             MenuItem("Exit", self.exit_app)
         )
@@ -353,25 +571,39 @@ USB Microphone se bolo -> Computer me type ho jayega!
 
 Hotkeys:
 • Ctrl+Shift+Space - Start/Stop Recording
-• Ctrl+Shift+L - Toggle Language
+• Ctrl+Shift+D - Continuous (hands-free) Dictation
+• Ctrl+Shift+L - Toggle Language (English / Hindi / Auto)
 
 Supported Languages:
 • English
 • हिंदी (Hindi)
         """
         
-        root = tk.Tk()
-        root.withdraw()
-        messagebox.showinfo("About Voice Typer", about_text)
-        root.destroy()
+        self.ui.message_box("About Voice Typer", about_text)
     
     def exit_app(self):
         """Exit the application"""
         print("\n👋 Exiting Voice Typer...")
         try:
             keyboard.unhook_all()
+            if self.pipeline:
+                self.pipeline.stop()
+            self.noise_monitor.stop()
+            self.spool.stop()
+            self.noise_floor.save_to(self.config)
+            self.language_priors.save_to(self.config)
+            print(tracer.format_summary())
+            if hasattr(self.engine, 'cache'):
+                print(f"🗂️  Recognition cache: {self.engine.cache.stats()}")
+            if upload_stats.utterances:
+                print(f"📦 Uploads: {upload_stats.summary(self.config.get('uplink_kbps', 256))}")
+            self.save_config()
+            self.mic_stream.stop()
+            if self.transcripts:
+                self.transcripts.close()
             if self.tray_icon:
                 self.tray_icon.stop()
+            self.ui.stop()
         except:
             pass
         os._exit(0)
@@ -386,7 +618,8 @@ Supported Languages:
         print("   2. Speak into your USB microphone")
         print(f"   3. Press {self.config['hotkey_record']} again to stop")
         print("   4. Text will be typed at cursor position!")
-        print(f"\n🌐 Press {self.config['hotkey_language_toggle']} to toggle language")
+        print(f"\n🎙️  Press {self.config.get('hotkey_continuous', 'ctrl+shift+d')} for continuous dictation")
+        print(f"🌐 Press {self.config['hotkey_language_toggle']} to toggle language")
         print("="*60 + "\n")
         
         # Keep the main thread alive
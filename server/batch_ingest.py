@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch Ingest
+Mobile ek hi request me kai phrases bhej sakta hai (/receive_batch).
+Retry me dobara aaye phrases (same client_id + seq) sirf ek baar type hote hain -
+lekin sirf jab client_id bheja ho (proxy ke peeche sab phones ka IP ek hi hota hai).
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+
+class SequenceDeduplicator:
+    """Remembers recently applied (client, seq) pairs"""
+
+    def __init__(self, per_client=1000, max_clients=256):
+        self.per_client = per_client
+        self.max_clients = max_clients
+        self._clients = OrderedDict()  # client -> (deque of seqs, set of seqs)
+        self._lock = threading.Lock()
+
+    def claim(self, client, seq):
+        """True the first time (client, seq) is seen, False for a retry"""
+        with self._lock:
+            entry = self._clients.get(client)
+            if entry is None:
+                entry = (deque(), set())
+                self._clients[client] = entry
+                if len(self._clients) > self.max_clients:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(client)
+
+            order, seen = entry
+            if seq in seen:
+                return False
+            order.append(seq)
+            seen.add(seq)
+            if len(order) > self.per_client:
+                seen.discard(order.popleft())
+            return True
+
+
+def parse_body(data):
+    """Check a POST body is a JSON object; returns its 'client_id' (or None)
+
+    Only an explicit client_id identifies a device: behind ngrok or any
+    proxy every phone shares one address and numbers its own seq from 0.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("body must be a JSON object")
+    client_id = data.get('client_id')
+    if client_id is not None and not isinstance(client_id, str):
+        raise ValueError("'client_id' must be a string")
+    return client_id or None
+
+
+def parse_timestamp(value):
+    """Client timestamp -> seconds since the epoch (None stays None)
+
+    Numbers are taken as they are; the mobile app sends ISO-8601 strings
+    (DateTime.toIso8601String), which are converted. Anything else raises
+    ValueError, so the paste worker only ever sorts numbers.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if not math.isfinite(value):
+            raise ValueError("'timestamp' must be a finite number")
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    raise ValueError("'timestamp' must be a number or an ISO-8601 string")
+
+
+def parse_phrase(data):
+    """Validate one phrase (/receive_text body, batch entry, /stream final)
+
+    Returns it with a numeric 'timestamp'. Raises ValueError when 'text'
+    is not a string or the timestamp cannot be read.
+    """
+    if not isinstance(data.get('text', ''), str):
+        raise ValueError("'text' must be a string")
+    return dict(data, timestamp=parse_timestamp(data.get('timestamp')))
+
+
+def parse_batch(data):
+    """Validate a /receive_batch body and return its phrases sorted by seq
+
+    Body: {"client_id": "...", "phrases": [{"seq": 1, "text": "...",
+           "timestamp": "...", "language": "...", "confidence": 0.9}, ...]}
+    Raises ValueError for malformed input, before any phrase is applied.
+    """
+    phrases = data.get('phrases')
+    if not isinstance(phrases, list):
+        raise ValueError("'phrases' must be a list")
+    for phrase in phrases:
+        if not isinstance(phrase, dict) or not isinstance(phrase.get('seq'), int):
+            raise ValueError("every phrase needs an integer 'seq'")
+    return sorted((parse_phrase(p) for p in phrases), key=lambda p: p['seq'])
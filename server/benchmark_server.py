@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server Load Benchmark
+N phones ek saath text bhejein to /receive_text kitni jaldi acknowledge hota hai
+
+Usage:
+    python speech_usb_only.py --no-paste          (doosre terminal me)
+    python benchmark_server.py --clients 8 --requests 50
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def poster(url, client_id, count, latencies, errors, lock):
+    """Send `count` phrases one after another and record each ack latency"""
+    for i in range(count):
+        body = json.dumps({
+            'text': f"client {client_id} phrase {i}",
+            'language': 'en-US',
+            'confidence': 1.0,
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            url + '/receive_text',
+            data=body,
+            headers={'Content-Type': 'application/json'},
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+        except Exception:
+            with lock:
+                errors.append(client_id)
+
+
+def run_benchmark(url, clients, requests_per_client):
+    """Run concurrent posters and return (latencies, errors, wall time)"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=poster,
+            args=(url, c, requests_per_client, latencies, errors, lock),
+        )
+        for c in range(clients)
+    ]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Magic Typer server load benchmark")
+    parser.add_argument('--url', default='http://localhost:8080')
+    parser.add_argument('--clients', type=int, default=8, help="concurrent posters")
+    parser.add_argument('--requests', type=int, default=50, help="requests per poster")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"Benchmark: {args.clients} clients x {args.requests} requests -> {args.url}")
+    print("=" * 60)
+
+    latencies, errors, wall = run_benchmark(args.url, args.clients, args.requests)
+    total = len(latencies)
+
+    print(f"Completed : {total} ok, {len(errors)} failed in {wall:.2f}s")
+    if total:
+        print(f"Throughput: {total / wall:.1f} req/s")
+        print(f"p50 ack   : {percentile(latencies, 50) * 1000:.1f} ms")
+        print(f"p99 ack   : {percentile(latencies, 99) * 1000:.1f} ms")
+        print(f"max ack   : {max(latencies) * 1000:.1f} ms")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
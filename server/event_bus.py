@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Event Bus
+Naya phrase aate hi sab live displays ko push hota hai (Server-Sent Events).
+Polling ki zarurat nahi.
+"""
+
+import json
+import threading
+from collections import deque
+
+KEEPALIVE_SECONDS = 15
+
+
+class EventBus:
+    """In-memory publish/subscribe with a sequence cursor per subscriber
+
+    Transient events (partial hypotheses) share the id sequence but live in
+    their own small buffer, so a fast talker's partials never push phrases
+    out of the replay buffer a reconnecting display resumes from.
+    """
+
+    def __init__(self, maxlen=256, transient_maxlen=16):
+        self._events = deque(maxlen=maxlen)
+        self._transient = deque(maxlen=transient_maxlen)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def last_id(self):
+        return self._seq
+
+    def publish(self, kind, **data):
+        """Add an event and wake every waiting subscriber; returns its id"""
+        return self._publish(self._events, kind, data)
+
+    def publish_transient(self, kind, **data):
+        """Like publish(), for events that are superseded anyway (partials)"""
+        return self._publish(self._transient, kind, data)
+
+    def _publish(self, buffer, kind, data):
+        with self._cond:
+            self._seq += 1
+            buffer.append(dict(data, id=self._seq, type=kind))
+            self._cond.notify_all()
+            return self._seq
+
+    def wait_for(self, since, timeout=KEEPALIVE_SECONDS):
+        """Block until there are events after `since` (or timeout)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > since, timeout=timeout)
+            events = [e for e in self._events if e['id'] > since]
+            transient = [e for e in self._transient if e['id'] > since]
+        if transient:
+            events = sorted(events + transient, key=lambda e: e['id'])
+        return events
+
+
+def stream_events(handler, bus, since=None):
+    """Serve an SSE stream from `bus` on a BaseHTTPRequestHandler
+
+    Resumes from the Last-Event-ID header (sent by EventSource on reconnect)
+    or `since`. A fresh client gets the latest event, like the old poll did.
+    """
+    last_id = handler.headers.get('Last-Event-ID')
+    if last_id and last_id.isdigit():
+        cursor = int(last_id)
+    elif since is not None:
+        cursor = since
+    else:
+        cursor = max(0, bus.last_id - 1)
+
+    handler.send_response(200)
+    handler.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+    handler.send_header('Cache-Control', 'no-cache')
+    handler.send_header('Connection', 'keep-alive')
+    handler.send_header('Access-Control-Allow-Origin', '*')
+    handler.end_headers()
+
+    try:
+        handler.wfile.write(b"retry: 2000\n\n")
+        handler.wfile.flush()
+        while True:
+            events = bus.wait_for(cursor)
+            if not events:
+                # Comment line keeps proxies (ngrok) from closing the stream
+                handler.wfile.write(b": keepalive\n\n")
+            for event in events:
+                payload = json.dumps(event, ensure_ascii=False)
+                handler.wfile.write(
+                    f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n".encode('utf-8')
+                )
+                cursor = event['id']
+            handler.wfile.flush()
+    except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+        pass  # Display closed
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrics (Prometheus)
+/metrics par request count, in-flight requests, receive->paste latency, paste failures,
+payload size aur har client ke phrases - Prometheus text format me. Request thread sirf
+apne shard me likhta hai (koi lock nahi); scrape ke waqt sab shards jod diye jaate hain.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+MAX_CLIENT_LABELS = 50   # Distinct 'client' series; later clients are counted as 'other'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms with one shard per writing thread
+
+    A thread only ever writes its own shard (a plain dict), so recording
+    takes no lock. `render()` adds all shards together; shards of threads
+    that have finished (ThreadingHTTPServer uses one per request) are
+    folded into a running total then, or on registration once more than
+    `max_shards` pile up between scrapes.
+    """
+
+    def __init__(self, max_shards=256):
+        self.max_shards = max_shards
+        self._metrics = {}          # name -> metric, in registration order
+        self._local = threading.local()
+        self._shards = []           # (thread, shard dict)
+        self._retired = {}          # Totals of finished threads
+        self._fold_lock = threading.Lock()
+
+    def counter(self, name, help, labels=()):
+        return self._register(Counter(self, name, help, labels))
+
+    def gauge(self, name, help, labels=(), func=None):
+        """`func` (no labels) is read at scrape time instead of inc/dec"""
+        return self._register(Gauge(self, name, help, labels, func))
+
+    def histogram(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        return self._register(Histogram(self, name, help, labels, buckets))
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._shards.append((threading.current_thread(), shard))
+            # Never waits: whoever holds the lock is already folding
+            if len(self._shards) > self.max_shards and self._fold_lock.acquire(blocking=False):
+                try:
+                    self._fold()
+                finally:
+                    self._fold_lock.release()
+        return shard
+
+    @staticmethod
+    def _add(totals, key, value):
+        if isinstance(value, list):
+            current = totals.get(key)
+            if current is None:
+                totals[key] = list(value)
+            else:
+                for i, v in enumerate(value):
+                    current[i] += v
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+    def _fold(self):
+        """Move shards of finished threads into the retired totals (fold lock held)"""
+        for entry in list(self._shards):
+            thread, shard = entry
+            if not thread.is_alive():
+                for key, value in shard.items():
+                    self._add(self._retired, key, value)
+                self._shards.remove(entry)
+
+    def collect(self):
+        """{(metric name, label values): value or [bucket counts..., sum]}"""
+        with self._fold_lock:
+            self._fold()
+            totals = {}
+            for key, value in self._retired.items():
+                self._add(totals, key, value)
+            for _, shard in list(self._shards):
+                # dict.copy() is atomic under the GIL; the owner may keep writing
+                for key, value in shard.copy().items():
+                    self._add(totals, key, value)
+        return totals
+
+    def render(self):
+        """Prometheus text exposition format"""
+        totals = self.collect()
+        by_metric = {}
+        for (name, values), value in totals.items():
+            by_metric.setdefault(name, []).append((values, value))
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples(sorted(by_metric.get(metric.name, []))))
+        return '\n'.join(lines) + '\n'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, registry, name, help, labels=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def inc(self, values=(), amount=1):
+        """`values` are the label values, in the order of `labels`"""
+        shard = self.registry._shard()
+        key = (self.name, values)
+        shard[key] = shard.get(key, 0) + amount
+
+    def samples(self, series):
+        if not series and not self.labels:
+            series = [((), 0)]   # Report 0 rather than no series at all
+        return [f"{self.name}{_labels(self.labels, values)} {_number(value)}"
+                for values, value in series]
+
+
+class Gauge(Counter):
+    """Sum of every thread's inc/dec, or the value of `func`"""
+    kind = 'gauge'
+
+    def __init__(self, registry, name, help, labels=(), func=None):
+        super().__init__(registry, name, help, labels)
+        self.func = func
+
+    def dec(self, values=(), amount=1):
+        self.inc(values, -amount)
+
+    def samples(self, series):
+        if self.func is not None:
+            return [f"{self.name} {_number(self.func())}"]
+        return super().samples(series)
+
+
+class Histogram(Counter):
+    """Cumulative buckets, sum and count, Prometheus style"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        super().__init__(registry, name, help, labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, values=()):
+        shard = self.registry._shard()
+        key = (self.name, values)
+        entry = shard.get(key)
+        if entry is None:
+            entry = shard[key] = [0] * (len(self.buckets) + 1)   # Buckets..., sum
+        entry[bisect.bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def samples(self, series):
+        lines = []
+        for values, entry in series:
+            cumulative = 0
+            for bound, n in zip(self.buckets, entry):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(entry[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class BoundedLabel:
+    """Label values from clients: the first `limit` distinct ones get their own series
+
+    Everything after that is reported as 'other', so a poster inventing
+    client_ids cannot grow the registry or /metrics without bound. Known
+    values are looked up without a lock.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._known = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        if value in self._known:
+            return value
+        with self._lock:
+            if len(self._known) < self.limit:
+                self._known.add(value)
+                return value
+        return 'other'
+
+
+# One registry per server process
+registry = MetricsRegistry()
+http_requests = registry.counter(
+    'typer_http_requests_total', "HTTP requests handled", ('method', 'path', 'status'))
+http_in_flight = registry.gauge(
+    'typer_http_in_flight_requests', "HTTP requests being handled right now")
+http_seconds = registry.histogram(
+    'typer_http_request_seconds', "Time to handle one HTTP request", ('path',))
+payload_bytes = registry.histogram(
+    'typer_payload_bytes', "Size of POST bodies", ('path',), buckets=BYTES_BUCKETS)
+client_phrases = registry.counter(
+    'typer_client_phrases_total', "Phrases received per client (use rate())", ('client',))
+client_label = BoundedLabel(MAX_CLIENT_LABELS)
+
+
+class InstrumentedHandler(BaseHTTPRequestHandler):
+    """Request handler that counts, times and tracks in-flight requests
+
+    Paths outside `metric_paths` are reported as 'other' so scanners
+    cannot blow up the number of series.
+    """
+
+    metric_paths = frozenset()
+
+    def send_response(self, code, message=None):
+        self.status_code = code
+        super().send_response(code, message)
+
+    def handle_one_request(self):
+        self.status_code = None
+        self.command = None
+        start = time.perf_counter()
+        http_in_flight.inc()
+        try:
+            super().handle_one_request()
+        finally:
+            http_in_flight.dec()
+            if self.command or self.status_code:   # Not for a connection closed unused
+                path = self.metric_path()
+                http_requests.inc((self.command or 'other', path, str(self.status_code or 0)))
+                http_seconds.observe(time.perf_counter() - start, (path,))
+
+    def metric_path(self):
+        path = urlsplit(getattr(self, 'path', '')).path
+        return path if path in self.metric_paths else 'other'
+
+    def send_metrics(self):
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
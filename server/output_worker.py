@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Output Worker
+HTTP request turant acknowledge hota hai, paste yeh worker alag thread me karta hai.
+Jaldi-jaldi aaye phrases ek hi paste me jod diye jaate hain (coalescing).
+"""
+
+import queue
+import threading
+import time
+
+
+class PasteWorker:
+    """Single consumer that pastes received text in order, merging bursts
+
+    With a `tracer` (latency_trace.LatencyTracer) each phrase records its
+    'queue_wait' (received -> paste starts) and 'receive_to_paste' spans.
+    With a `metrics` registry (metrics.MetricsRegistry) it also exports
+    the receive -> paste histogram, paste failures and queue depth.
+    """
+
+    def __init__(self, paste_func, coalesce_window=0.15, separator=' ', tracer=None,
+                 metrics=None):
+        self.paste_func = paste_func
+        self.tracer = tracer
+        self.metrics = metrics
+        self.coalesce_window = coalesce_window
+        self.separator = separator
+        self.queue = queue.Queue()
+
+        # Counters (only the worker thread writes these, except `received`)
+        self.received = 0
+        self.pastes = 0
+        self.phrases_pasted = 0
+        self._arrival = 0
+        self._arrival_lock = threading.Lock()
+
+        if metrics is not None:
+            self._paste_seconds = metrics.histogram(
+                'typer_receive_to_paste_seconds', "Time from receiving a phrase to its paste finishing")
+            self._paste_failures = metrics.counter(
+                'typer_paste_failures_total', "Pastes that raised an error")
+            metrics.gauge('typer_paste_queue_depth', "Phrases waiting to be pasted",
+                          func=self.queue.qsize)
+
+        self.thread = threading.Thread(target=self._run, name="PasteWorker", daemon=True)
+        self.thread.start()
+
+    def submit(self, text, timestamp=None, utterance=None):
+        """Queue text for pasting (returns immediately)
+
+        `timestamp` is the client's timestamp, used to order phrases that end
+        up in the same merged paste. Without it arrival order is kept.
+        `utterance` tags this phrase's latency spans.
+        """
+        if not text:
+            return
+        with self._arrival_lock:
+            self._arrival += 1
+            arrival = self._arrival
+            self.received += 1
+        self.queue.put((timestamp, arrival, text, utterance, time.perf_counter()))
+
+    def stats(self):
+        """Queue depth and merge counters"""
+        return {
+            'queue_depth': self.queue.qsize(),
+            'received': self.received,
+            'pastes': self.pastes,
+            'phrases_pasted': self.phrases_pasted,
+            'merge_ratio': round(self.phrases_pasted / self.pastes, 2) if self.pastes else 0.0,
+        }
+
+    def _collect_batch(self):
+        """Block for one phrase, then gather whatever arrives within the window"""
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.coalesce_window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Drain anything else already waiting so a backlog costs one paste
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Paste merged batches one at a time"""
+        while True:
+            batch = self._collect_batch()
+            started = time.perf_counter()
+            # Sort, join and paste together: one bad batch must not kill the only paste thread
+            try:
+                # Client timestamp first (when every phrase has one), then arrival
+                if all(item[0] is not None for item in batch):
+                    batch.sort(key=lambda item: (item[0], item[1]))
+                text = self.separator.join(item[2] for item in batch)
+                if self.tracer:
+                    # Clipboard/paste spans inside paste_func belong to the first phrase
+                    self.tracer.set_current(batch[0][3])
+                self.paste_func(text)
+            except Exception as e:
+                print(f"❌ Paste error: {e}")
+                if self.metrics is not None:
+                    self._paste_failures.inc()
+            finally:
+                if self.tracer:
+                    done = time.perf_counter()
+                    for item in batch:
+                        self.tracer.record('queue_wait', started - item[4], item[3])
+                        self.tracer.record('receive_to_paste', done - item[4], item[3])
+                if self.metrics is not None:
+                    done = time.perf_counter()
+                    for item in batch:
+                        self._paste_seconds.observe(done - item[4])
+                self.pastes += 1
+                self.phrases_pasted += len(batch)
+                for _ in batch:
+                    self.queue.task_done()
@@ -6,22 +6,35 @@ Mobile se bolo -> Computer khud type karega (Auto-Paste)
 """
 
 import sys
+import os
 import io
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 import json
 import socket
 import time
 import webbrowser
+from urllib.parse import urlsplit, parse_qs
+
+from output_worker import PasteWorker
+from event_bus import EventBus, stream_events
+from transcript_history import TranscriptHistory
+from batch_ingest import SequenceDeduplicator, parse_batch, parse_body, parse_phrase
+from websocket_stream import serve_stream
+from metrics import InstrumentedHandler, registry, payload_bytes, client_phrases, client_label
+
+# Shared modules (transcript store, ...) live in desktop_app/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'desktop_app'))
+from transcript_store import TranscriptStore
+from latency_trace import tracer
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-# Import automation libraries
+# Import automation libraries (clipboard_paste needs pyperclip + pyautogui)
 try:
-    import pyperclip
-    import pyautogui
+    from clipboard_paste import ClipboardNotReady, PasteTransaction
     MAGIC_AVAILABLE = True
     print("[OK] Automation libraries loaded successfully!")
 except ImportError as e:
@@ -39,68 +52,171 @@ except ImportError:
 # Global variables
 latest_text = ""
 public_url = ""
+paste_enabled = True
+COALESCE_WINDOW = 0.15  # Phrases arriving within this many seconds are pasted together
+
+
+def paste_text(text):
+    """Copy text to clipboard and paste it at the cursor (runs on the paste worker)"""
+    if not (MAGIC_AVAILABLE and paste_enabled):
+        return
+
+    # 1. Beep to alert user (System default sound)
+    print("🔔 Beep!")
+    sys.stdout.write('\a')
+    sys.stdout.flush()
+
+    # 2. Clipboard -> Ctrl+V -> user's clipboard restored (no fixed sleeps)
+    print("⌨️  Pasting...")
+    try:
+        timings = paste_transaction.paste(text)
+    except ClipboardNotReady:
+        # Nothing was pasted: another app may have held the clipboard, try once more
+        timings = paste_transaction.paste(text)
+    print(f"✅ DONE! ({timings['total_ms']:.0f} ms)")
+
+
+paste_transaction = PasteTransaction() if MAGIC_AVAILABLE else None
+paste_worker = PasteWorker(paste_text, coalesce_window=COALESCE_WINDOW, tracer=tracer,
+                           metrics=registry)
+history = TranscriptHistory(capacity=1000)  # Recent phrases for /history
+transcripts = TranscriptStore()  # Permanent searchable log on disk
+deduplicator = SequenceDeduplicator()  # Drops retried (client_id, seq) phrases (explicit client_id only)
+event_bus = EventBus()  # Pushes new phrases to live displays (/events)
+
+class MagicTyperHandler(InstrumentedHandler):
+    metric_paths = frozenset({'/', '/ping', '/events', '/stream', '/history', '/stats', '/latency',
+                              '/metrics', '/receive_text', '/receive_batch'})
 
-class MagicTyperHandler(BaseHTTPRequestHandler):
     def do_GET(self):
-        if self.path == '/':
+        url = urlsplit(self.path)
+        if url.path == '/':
             self.send_response(200)
             self.send_header('Content-type', 'text/html; charset=utf-8')
             self.end_headers()
             self.wfile.write(self.get_html_page().encode('utf-8'))
-        elif self.path == '/ping':
+        elif url.path == '/ping':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             self.wfile.write(json.dumps({'status': 'ok'}).encode())
+        elif url.path == '/events':
+            since = parse_qs(url.query).get('since', [''])[0]
+            stream_events(self, event_bus, int(since) if since.isdigit() else None)
+        elif url.path == '/stream':
+            # WebSocket: partial + final hypotheses on one connection
+            client_id = parse_qs(url.query).get('client_id', [None])[0]
+            serve_stream(self, event_bus, lambda data: self.receive_phrase(client_id, data))
+        elif url.path == '/history':
+            since = parse_qs(url.query).get('since', ['0'])[0]
+            phrases = history.since(int(since) if since.isdigit() else 0)
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps({
+                'last_seq': history.last_seq,
+                'phrases': [p.to_dict() for p in phrases],
+            }, ensure_ascii=False).encode('utf-8'))
+        elif url.path == '/stats':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(paste_worker.stats()).encode())
+        elif url.path == '/latency':
+            # Per-stage latency histograms (queue wait, clipboard, paste, HTTP ack)
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(tracer.summary()).encode())
+        elif url.path == '/metrics':
+            # Prometheus scrape: request counts, in-flight, paste latency, payload sizes
+            self.send_metrics()
         else:
             self.send_response(404)
             self.end_headers()
 
     def do_POST(self):
-        if self.path == '/receive_text':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+        received_at = time.perf_counter()
+        self.utterance = None
+        if self.path not in ('/receive_text', '/receive_batch'):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        content_length = int(self.headers['Content-Length'])
+        post_data = self.rfile.read(content_length)
+        payload_bytes.observe(content_length, (self.path,))
+        
+        try:
+            data = json.loads(post_data.decode('utf-8'))
+            client_id = parse_body(data)  # ValueError -> 400 for an array, string, ...
             
-            try:
-                data = json.loads(post_data.decode('utf-8'))
-                text = data.get('text', '')
-                
-                print(f"\n{'='*40}")
-                print(f"🎤 RECEIVED: {text}")
-                
-                if MAGIC_AVAILABLE and text:
-                    # 1. Copy to clipboard
-                    pyperclip.copy(text)
-                    print("📋 Copied to clipboard...")
-                    
-                    # 2. Beep to alert user (System default sound)
-                    print("🔔 Beep!")
-                    sys.stdout.write('\a')
-                    sys.stdout.flush()
-                    
-                    # 3. Wait a bit
-                    time.sleep(0.2)
-                    
-                    # 4. Robust Paste (Hold Ctrl -> Press V -> Release Ctrl)
-                    print("⌨️  Pasting...")
-                    pyautogui.keyDown('ctrl')
-                    pyautogui.press('v')
-                    pyautogui.keyUp('ctrl')
-                    print("✅ DONE!")
-                
-                print(f"{'='*40}\n")
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps({'status': 'success'}).encode())
+            if self.path == '/receive_text':
+                self.receive_phrase(client_id, data)
+                response = {'status': 'success'}
+            else:
+                # Several phrases in one round trip, applied in seq order
+                phrases = parse_batch(data)
+                accepted = sum(1 for phrase in phrases if self.receive_phrase(client_id, phrase))
+                response = {
+                    'status': 'success',
+                    'accepted': accepted,
+                    'duplicates': len(phrases) - accepted,
+                }
             
-            except Exception as e:
-                print(f"Error: {e}")
-                self.send_response(500)
-                self.end_headers()
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(response).encode())
+            tracer.record('http_ack', time.perf_counter() - received_at, self.utterance)
+        
+        except ValueError as e:
+            # Malformed JSON or phrase: tell the client instead of queueing it
+            self.send_bad_request(e)
+        except Exception as e:
+            print(f"Error: {e}")
+            self.send_response(500)
+            self.end_headers()
+
+    def send_bad_request(self, error):
+        self.send_response(400)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps({'status': 'error', 'error': str(error)}).encode())
+
+    def receive_phrase(self, client_id, data):
+        """Record, broadcast and queue one phrase; False if it is a retried duplicate"""
+        data = parse_phrase(data)  # ValueError -> 400 (text must be str, timestamp numeric)
+        client = client_id or self.client_address[0]
+        seq = data.get('seq')
+        # Retries are only recognisable per device; without a client_id nothing is dropped
+        if client_id and isinstance(seq, int) and not deduplicator.claim(client_id, seq):
+            return False
+
+        text = data.get('text', '')
+        # Latency spans of this phrase are tagged client:seq
+        self.utterance = f"{client}:{seq}" if isinstance(seq, int) else tracer.new_id()
+        client_phrases.inc((client_label(client),))
+        
+        print(f"\n{'='*40}")
+        print(f"🎤 RECEIVED: {text}")
+        print(f"{'='*40}\n")
+        
+        # Paste happens on the worker thread, respond right away
+        paste_worker.submit(text, data.get('timestamp'), self.utterance)
+        if text:
+            phrase = history.append(text, data.get('language'), data.get('confidence'))
+            event_bus.publish('phrase', **phrase.to_dict())
+            transcripts.append(text, source=client,
+                               language=phrase.language, confidence=phrase.confidence,
+                               timestamp=phrase.timestamp)
+        return True
 
     def log_message(self, format, *args):
         pass
@@ -142,7 +258,11 @@ def get_local_ip():
 def main():
     PORT = 8080
     local_ip = get_local_ip()
-    global public_url
+    global public_url, paste_enabled
+    
+    # --no-paste: accept text but don't touch clipboard/keyboard (for benchmarks)
+    if '--no-paste' in sys.argv:
+        paste_enabled = False
     
     print("\n" + "█"*60)
     print("   ✨ SPEECH TO TEXT MAGIC TYPER (INTERNET MODE) ✨")
@@ -186,11 +306,12 @@ def main():
     except:
         pass
 
-    server = HTTPServer(('0.0.0.0', PORT), MagicTyperHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', PORT), MagicTyperHandler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("Stopped.")
+        transcripts.close()
         if NGROK_AVAILABLE:
             ngrok.kill()
 
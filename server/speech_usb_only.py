@@ -5,16 +5,61 @@ Simple server that receives text and pastes it
 """
 
 import sys
+import os
 import time
-import pyperclip
-import pyautogui
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 import json
+from urllib.parse import urlsplit, parse_qs
+
+from output_worker import PasteWorker
+from event_bus import EventBus, stream_events
+from transcript_history import TranscriptHistory
+from batch_ingest import SequenceDeduplicator, parse_batch, parse_body, parse_phrase
+from websocket_stream import serve_stream
+from metrics import InstrumentedHandler, registry, payload_bytes, client_phrases, client_label
+
+# Shared modules (transcript store, ...) live in desktop_app/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'desktop_app'))
+from transcript_store import TranscriptStore
+from clipboard_paste import ClipboardNotReady, PasteTransaction  # Needs pyperclip + pyautogui
+from latency_trace import tracer
 
 PORT = 8080
 latest_text = ""  # Store latest text for web display
+paste_enabled = '--no-paste' not in sys.argv  # --no-paste for benchmarks
+COALESCE_WINDOW = 0.15  # Phrases arriving within this many seconds are pasted together
+
+
+def paste_text(text):
+    """Copy, beep and paste (runs on the paste worker thread)"""
+    if not paste_enabled:
+        return
+
+    # 1. Beep
+    sys.stdout.write('\a')
+    sys.stdout.flush()
+
+    # 2. Copy + Paste, then put the user's clipboard back
+    try:
+        timings = paste_transaction.paste(text)
+    except ClipboardNotReady:
+        # Nothing was pasted: another app may have held the clipboard, try once more
+        timings = paste_transaction.paste(text)
+    print(f"PASTED! ({timings['total_ms']:.0f} ms)")
+
+
+paste_transaction = PasteTransaction()
+paste_worker = PasteWorker(paste_text, coalesce_window=COALESCE_WINDOW, tracer=tracer,
+                           metrics=registry)
+history = TranscriptHistory(capacity=1000)  # Recent phrases for /history
+transcripts = TranscriptStore()  # Permanent searchable log on disk
+deduplicator = SequenceDeduplicator()  # Drops retried (client_id, seq) phrases (explicit client_id only)
+event_bus = EventBus()  # Pushes new phrases to live_display.html
+
+class MagicTyperHandler(InstrumentedHandler):
+    metric_paths = frozenset({'/ping', '/events', '/get_latest_text', '/stream', '/history', '/stats',
+                              '/latency', '/metrics', '/receive_text', '/receive_batch'})
 
-class MagicTyperHandler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
         """Handle CORS preflight"""
         self.send_response(200)
@@ -25,58 +70,132 @@ class MagicTyperHandler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/ping':
+        url = urlsplit(self.path)
+        if url.path == '/ping':
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             self.wfile.write(json.dumps({'status': 'ok'}).encode())
-        elif self.path == '/get_latest_text':
+        elif url.path == '/events':
+            since = parse_qs(url.query).get('since', [''])[0]
+            stream_events(self, event_bus, int(since) if since.isdigit() else None)
+        elif url.path == '/get_latest_text':
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             self.wfile.write(json.dumps({'text': latest_text}).encode())
+        elif url.path == '/stream':
+            # WebSocket: partial + final hypotheses on one connection
+            client_id = parse_qs(url.query).get('client_id', [None])[0]
+            serve_stream(self, event_bus, lambda data: self.receive_phrase(client_id, data))
+        elif url.path == '/history':
+            since = parse_qs(url.query).get('since', ['0'])[0]
+            phrases = history.since(int(since) if since.isdigit() else 0)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps({
+                'last_seq': history.last_seq,
+                'phrases': [p.to_dict() for p in phrases],
+            }, ensure_ascii=False).encode('utf-8'))
+        elif url.path == '/stats':
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(paste_worker.stats()).encode())
+        elif url.path == '/latency':
+            # Per-stage latency histograms (queue wait, clipboard, paste, HTTP ack)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps(tracer.summary()).encode())
+        elif url.path == '/metrics':
+            # Prometheus scrape: request counts, in-flight, paste latency, payload sizes
+            self.send_metrics()
         else:
             self.send_response(404)
             self.end_headers()
 
     def do_POST(self):
         """Handle text from mobile"""
-        global latest_text
-        
-        if self.path == '/receive_text':
+        received_at = time.perf_counter()
+        self.utterance = None
+        if self.path in ('/receive_text', '/receive_batch'):
             content_length = int(self.headers['Content-Length'])
             post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-            text = data.get('text', '')
-            
-            print(f"\nReceived: {text}")
-            latest_text = text  # Store for web display
-            
-            if text:
-                # 1. Copy
-                pyperclip.copy(text)
-                
-                # 2. Beep
-                sys.stdout.write('\a')
-                sys.stdout.flush()
-                
-                # 3. Paste
-                pyautogui.hotkey('ctrl', 'v')
-                print("PASTED!")
+            payload_bytes.observe(content_length, (self.path,))
+            try:
+                data = json.loads(post_data.decode('utf-8'))
+                client_id = parse_body(data)  # ValueError -> 400 for an array, string, ...
+
+                if self.path == '/receive_text':
+                    self.receive_phrase(client_id, data)
+                    response = {'status': 'success'}
+                else:
+                    # Batch upload: several phrases, applied in seq order
+                    phrases = parse_batch(data)
+                    accepted = sum(1 for phrase in phrases if self.receive_phrase(client_id, phrase))
+                    response = {
+                        'status': 'success',
+                        'accepted': accepted,
+                        'duplicates': len(phrases) - accepted,
+                    }
+            except ValueError as e:
+                # Malformed JSON or phrase: tell the client instead of queueing it
+                self.send_bad_request(e)
+                return
             
             # Response
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            response = {'status': 'success'}
             self.wfile.write(json.dumps(response).encode())
+            tracer.record('http_ack', time.perf_counter() - received_at, self.utterance)
         else:
             self.send_response(404)
             self.end_headers()
 
+    def send_bad_request(self, error):
+        self.send_response(400)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps({'status': 'error', 'error': str(error)}).encode())
+
+    def receive_phrase(self, client_id, data):
+        """Store and queue one phrase; False if it is a retried duplicate"""
+        global latest_text
+        
+        data = parse_phrase(data)  # ValueError -> 400 (text must be str, timestamp numeric)
+        client = client_id or self.client_address[0]
+        seq = data.get('seq')
+        # Retries are only recognisable per device; without a client_id nothing is dropped
+        if client_id and isinstance(seq, int) and not deduplicator.claim(client_id, seq):
+            return False
+        
+        text = data.get('text', '')
+        # Latency spans of this phrase are tagged client:seq
+        self.utterance = f"{client}:{seq}" if isinstance(seq, int) else tracer.new_id()
+        client_phrases.inc((client_label(client),))
+        print(f"\nReceived: {text}")
+        latest_text = text  # Store for web display
+        if text:
+            phrase = history.append(text, data.get('language'), data.get('confidence'))
+            event_bus.publish('phrase', **phrase.to_dict())
+            transcripts.append(text, source=client,
+                               language=phrase.language, confidence=phrase.confidence,
+                               timestamp=phrase.timestamp)
+        
+        # Paste on the worker thread so this request is acknowledged immediately
+        paste_worker.submit(text, data.get('timestamp'), self.utterance)
+        return True
+
 if __name__ == '__main__':
     print("=" * 60)
     print("MAGIC TYPER - USB MODE")
@@ -85,6 +204,9 @@ if __name__ == '__main__':
     print(f"Use this URL in your mobile app")
     print("=" * 60)
     
-    server = HTTPServer(('0.0.0.0', PORT), MagicTyperHandler)
-    server.serve_forever()
+    server = ThreadingHTTPServer(('0.0.0.0', PORT), MagicTyperHandler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        transcripts.close()
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Transcript History
+Pichhle phrases ka fixed-size ring buffer. Display reconnect kare to
+/history?since=<seq> se sirf chhoote hue phrases mil jaate hain.
+"""
+
+import threading
+import time
+
+
+class Phrase:
+    """One received phrase (slots keep thousands of these cheap)"""
+
+    __slots__ = ('seq', 'text', 'language', 'confidence', 'timestamp')
+
+    def __init__(self, seq, text, language, confidence, timestamp):
+        self.seq = seq
+        self.text = text
+        self.language = language
+        self.confidence = confidence
+        self.timestamp = timestamp
+
+    def to_dict(self):
+        return {
+            'seq': self.seq,
+            'text': self.text,
+            'language': self.language,
+            'confidence': self.confidence,
+            'timestamp': self.timestamp,
+        }
+
+
+class TranscriptHistory:
+    """Bounded ring buffer of recent phrases addressed by sequence id"""
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_seq(self):
+        return self._last_seq
+
+    def append(self, text, language=None, confidence=None, timestamp=None):
+        """Store a phrase, overwriting the oldest one when full"""
+        with self._lock:
+            self._last_seq += 1
+            phrase = Phrase(
+                self._last_seq,
+                text,
+                language,
+                confidence,
+                timestamp if timestamp is not None else time.time(),
+            )
+            self._slots[self._last_seq % self.capacity] = phrase
+            return phrase
+
+    def since(self, seq, limit=None):
+        """Phrases newer than `seq`, oldest first
+
+        Only the requested slots are touched; anything already overwritten
+        is simply not returned (caller sees the gap in seq numbers).
+        """
+        with self._lock:
+            last = self._last_seq
+            first = max(seq + 1, last - self.capacity + 1, 1)
+            if limit is not None:
+                last = min(last, first + limit - 1)
+            return [self._slots[s % self.capacity] for s in range(first, last + 1)]
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebSocket Stream
+Mobile ek hi connection par bolte-bolte partial text bhejta hai.
+Partial turant live display par dikhta hai, sirf final text paste hota hai.
+
+Messages (JSON text frames, client -> server):
+    {"type": "partial", "utterance": 7, "rev": 3, "text": "hello wor"}
+    {"type": "final", "utterance": 7, "rev": 4, "text": "hello world",
+     "seq": 12, "language": "en-US", "confidence": 0.93, "timestamp": "..."}
+Server -> client:
+    {"type": "ack", "utterance": 7, "rev": 4}
+    {"type": "error", "utterance": 7, "rev": 4, "error": "..."}   (final rejected)
+"""
+
+import base64
+import hashlib
+import json
+import struct
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+class WebSocketConnection:
+    """Minimal RFC 6455 server-side connection over a handler's socket files"""
+
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+
+    def _read_exact(self, n):
+        data = self.rfile.read(n)
+        if len(data) < n:
+            raise ConnectionResetError("client went away")
+        return data
+
+    def _read_frame(self):
+        b1, b2 = self._read_exact(2)
+        fin = bool(b1 & 0x80)
+        opcode = b1 & 0x0F
+        length = b2 & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', self._read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack('!Q', self._read_exact(8))[0]
+        if length > MAX_MESSAGE_BYTES:
+            raise ValueError("message too large")
+
+        mask = self._read_exact(4) if b2 & 0x80 else None
+        payload = self._read_exact(length)
+        if mask and length:
+            # XOR the whole payload at once instead of byte by byte
+            key = (mask * (length // 4 + 1))[:length]
+            payload = (int.from_bytes(payload, 'big') ^ int.from_bytes(key, 'big')).to_bytes(length, 'big')
+        return fin, opcode, payload
+
+    def _send_frame(self, opcode, payload=b''):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([length])
+        elif length < 65536:
+            header += bytes([126]) + struct.pack('!H', length)
+        else:
+            header += bytes([127]) + struct.pack('!Q', length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
+
+    def send_text(self, text):
+        self._send_frame(OP_TEXT, text.encode('utf-8'))
+
+    def recv(self):
+        """Next complete text message, or None once the client closes"""
+        fragments = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+            if opcode == OP_CLOSE:
+                self._send_frame(OP_CLOSE, payload[:2])
+                return None
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            fragments.append(payload)
+            if sum(len(f) for f in fragments) > MAX_MESSAGE_BYTES:
+                raise ValueError("message too large")
+            if fin:
+                return b''.join(fragments).decode('utf-8')
+
+
+def accept_websocket(handler):
+    """Complete the upgrade handshake; returns a connection or None"""
+    key = handler.headers.get('Sec-WebSocket-Key')
+    if handler.headers.get('Upgrade', '').lower() != 'websocket' or not key:
+        handler.send_response(400)
+        handler.end_headers()
+        return None
+
+    accept = base64.b64encode(
+        hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()
+    ).decode('ascii')
+    handler.protocol_version = 'HTTP/1.1'  # Clients reject an HTTP/1.0 upgrade
+    handler.send_response(101, 'Switching Protocols')
+    handler.send_header('Upgrade', 'websocket')
+    handler.send_header('Connection', 'Upgrade')
+    handler.send_header('Sec-WebSocket-Accept', accept)
+    handler.end_headers()
+    handler.wfile.flush()
+    handler.close_connection = True
+    return WebSocketConnection(handler.rfile, handler.wfile)
+
+
+def serve_stream(handler, bus, on_final):
+    """Run one streaming session until the client disconnects
+
+    Partials are published on `bus` as transient 'partial' events (older
+    revisions of the same utterance are dropped, and they are not kept for
+    replay). Finals go to `on_final(data)`, which pastes/stores them exactly
+    like /receive_text; a ValueError from it is answered with an 'error'.
+    """
+    connection = accept_websocket(handler)
+    if connection is None:
+        return
+
+    latest_rev = {}  # utterance -> newest revision seen (inf once final)
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            try:
+                data = json.loads(message)
+                kind = data.get('type')
+                utterance = data.get('utterance')
+                rev = data.get('rev', 0)
+            except (ValueError, AttributeError):
+                continue
+            # utterance is a dict key below; anything unhashable would end the session
+            if not isinstance(rev, int) or not (utterance is None or isinstance(utterance, (str, int))):
+                continue
+
+            if rev < latest_rev.get(utterance, -1):
+                continue  # Out-of-date revision
+            latest_rev[utterance] = rev
+
+            if kind == 'partial':
+                # Not kept for replay: a partial must not evict a final phrase
+                bus.publish_transient('partial', utterance=utterance, rev=rev, text=data.get('text', ''))
+            elif kind == 'final':
+                latest_rev[utterance] = float('inf')  # Ignore stragglers
+                if len(latest_rev) > 256:
+                    del latest_rev[next(iter(latest_rev))]
+                try:
+                    on_final(data)
+                except ValueError as e:
+                    # Rejected final (bad text/timestamp): keep the connection
+                    connection.send_text(json.dumps(
+                        {'type': 'error', 'utterance': utterance, 'rev': rev, 'error': str(e)}))
+                    continue
+                connection.send_text(json.dumps({'type': 'ack', 'utterance': utterance, 'rev': rev}))
+    except (ConnectionResetError, BrokenPipeError, ConnectionAbortedError, ValueError):
+        pass